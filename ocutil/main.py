@@ -4,28 +4,47 @@ import os
 import sys
 import multiprocessing
 import logging
+import logging.handlers
+import queue
+import threading
+import atexit
 import time
 import glob
-# import math # No longer needed here
-# import datetime # No longer needed here
-from urllib.parse import urlparse
-
-import oci
-
-# Core Utils
-from ocutil.utils.oci_manager import OCIManager
-from ocutil.utils.formatters import human_readable_size # Import formatter
-
-# Command Handlers/Classes
-from ocutil.utils.uploader import Uploader
-from ocutil.utils.downloader import Downloader
-from ocutil.utils.lister import Lister # Import the new Lister
-
+import itertools
+import concurrent.futures
+import fnmatch
+import re
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+# The oci SDK and the command classes are imported inside the functions that need them,
+# so '--help' and argument errors do not pay the SDK's import cost.
+if TYPE_CHECKING:
+    from ocutil.utils.oci_manager import OCIManager
+
+
+_OC_SCHEME = "oc://"
+_OC_SCHEME_LEN = len(_OC_SCHEME)
+# Extensions that make a download source almost certainly a single object, so the
+# file-or-prefix probe is skipped for them
+_COMMON_FILE_EXTENSIONS = frozenset({
+    '.gz', '.zst', '.bz2', '.xz', '.tar', '.tgz', '.zip', '.parquet', '.csv', '.json', '.txt',
+    '.log', '.bin', '.jpg', '.jpeg', '.png', '.pdf', '.bam', '.vcf',
+})
+# Characters that make a local source a glob pattern; one C-level scan instead of three
+_WILDCARD_RE = re.compile(r"[*?\[]")
+
+# Log records held before a write when stderr is not a terminal, and the longest any is held
+LOG_BUFFER_CAPACITY = 64
+LOG_BUFFER_FLUSH_INTERVAL = 1.0
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOG_FILE_BUFFER_SIZE = 64 * 1024
 
 # --- Helper Functions ---
 def is_remote_path(path: str) -> bool:
     """Return True if the given path starts with 'oc://'."""
-    return path.startswith("oc://")
+    return path.startswith(_OC_SCHEME)
 
 def parse_remote_path(remote_path: str):
     """
@@ -35,160 +54,450 @@ def parse_remote_path(remote_path: str):
         bucket_name (str): Name of the OCI bucket.
         object_path (str): Path to the object inside the bucket (prefix).
     """
-    parsed = urlparse(remote_path)
-    if parsed.scheme != "oc":
+    if not remote_path.startswith(_OC_SCHEME):
         raise ValueError("Remote path must start with 'oc://'")
-    bucket_name = parsed.netloc
+    # A plain split is much cheaper than urlparse and keeps '?' and '#' as part of the object name
+    bucket_name, _, object_path = remote_path[_OC_SCHEME_LEN:].partition('/')
     if not bucket_name:
         raise ValueError("Bucket name cannot be empty in remote path.")
     # Ensure object_path does not have a leading slash (for consistency)
-    object_path = parsed.path.lstrip('/')
+    object_path = object_path.lstrip('/')
     return bucket_name, object_path
 
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders each timestamp second once; the date format has no sub-second fields."""
+
+    _cached = (None, '')
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, cached_text = self._cached
+        if second != cached_second:
+            cached_text = super().formatTime(record, datefmt)
+            # A single tuple assignment keeps the cache consistent across logging threads
+            self._cached = (second, cached_text)
+        return cached_text
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that writes through a LOG_FILE_BUFFER_SIZE buffer instead of flushing every record.
+    Warnings and errors still flush immediately; the rest is written when the buffer fills or
+    when logging shuts down at exit.
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_FILE_BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler that also writes out its buffer LOG_BUFFER_FLUSH_INTERVAL seconds after the
+    first record was held, so progress messages are not delayed until the buffer fills.
+    """
+
+    _timer = None
+
+    def emit(self, record):
+        # Called with the handler lock held
+        super().emit(record)
+        if self.buffer and self._timer is None:
+            self._timer = threading.Timer(LOG_BUFFER_FLUSH_INTERVAL, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            super().flush()
+
+
 def setup_logging(log_file=None, verbose=False):
     """Configure logging format, level, and handlers."""
     log_level = logging.DEBUG if verbose else logging.INFO
+    log_format = '%(asctime)s [%(levelname)s] %(threadName)s %(name)s: %(message)s'
+    log_formatter = _CachedTimeFormatter(log_format, datefmt=LOG_DATE_FORMAT)
     # Default handler writes to stderr
-    handlers = [logging.StreamHandler(sys.stderr)]
-    log_formatter = logging.Formatter(
-        '%(asctime)s [%(levelname)s] %(threadName)s %(name)s: %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(log_formatter)
+    if sys.stderr.isatty():
+        handlers = [stderr_handler]
+    else:
+        # Redirected output (pipes, log collectors) is written in batches of records instead of
+        # one write per record; warnings and errors still flush immediately, nothing is held
+        # longer than LOG_BUFFER_FLUSH_INTERVAL, and logging's exit hook flushes whatever is left.
+        handlers = [_TimedMemoryHandler(
+            LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=stderr_handler
+        )]
 
     if log_file:
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
+        if log_dir:
             try:
-                os.makedirs(log_dir)
+                os.makedirs(log_dir, exist_ok=True)
             except OSError as e:
                  print(f"Warning: Could not create log directory '{log_dir}': {e}", file=sys.stderr)
                  log_file = None # Disable file logging if dir creation fails
         if log_file:
              try:
-                 file_handler = logging.FileHandler(log_file)
+                 file_handler = _BufferedFileHandler(log_file)
                  file_handler.setFormatter(log_formatter)
                  handlers.append(file_handler)
              except OSError as e:
                   print(f"Warning: Could not open log file '{log_file}': {e}", file=sys.stderr)
 
+    # The handlers above run on a background listener thread; logging calls on transfer
+    # threads only put the record on a queue instead of taking handler locks and writing.
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Only merges the message with its arguments; the listener's handlers apply log_format
+    queue_handler.setFormatter(logging.Formatter())
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    # Lets forked worker processes reach the real handlers (see ocutil.utils.concurrency)
+    queue_handler.listener = listener
+
     # Configure root logger
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s [%(levelname)s] %(threadName)s %(name)s: %(message)s',
-        handlers=handlers, # Use handlers list defined above
-        datefmt='%Y-%m-%d %H:%M:%S'
+        format=log_format,
+        handlers=[queue_handler],
+        datefmt=LOG_DATE_FORMAT
     )
+    # basicConfig leaves an already configured root logger alone
+    if queue_handler in logging.getLogger().handlers:
+        listener.start()
+        atexit.register(listener.stop)
 
     # Set levels for noisy libraries
     oci_log_level = logging.DEBUG if verbose else logging.WARNING
     logging.getLogger('oci').setLevel(oci_log_level)
     urllib3_log_level = logging.DEBUG if verbose else logging.WARNING
-    logging.getLogger("urllib3.connectionpool").setLevel(urllib3_log_level)
+    # Older SDKs log through their vendored copy of urllib3
+    for urllib3_logger in ("urllib3.connectionpool", "oci._vendor.urllib3.connectionpool"):
+        logging.getLogger(urllib3_logger).setLevel(urllib3_log_level)
 
     # Return the main application logger instance
     return logging.getLogger('ocutil')
 
 
-def adjust_remote_object_path(local_source: str, object_path: str) -> str:
+def flush_logging():
+    """Writes out any log records still queued or held by buffering handlers."""
+    for handler in logging.getLogger().handlers:
+        listener = getattr(handler, 'listener', None)
+        if listener is not None:
+            # Stopping drains the queue; restart so records logged afterwards are still handled
+            listener.stop()
+            listener.start()
+            for target in listener.handlers:
+                target.flush()
+        handler.flush()
+
+
+def iter_wildcard_matches(pattern: str):
+    """
+    Lazily yields the regular files matching a local wildcard pattern.
+    When only the last path component has wildcards, the directory is read once with os.scandir
+    and entries are filtered by name and DirEntry.is_file(), which uses the type from the
+    directory listing instead of a stat() per match. Other patterns fall back to glob.iglob.
+    """
+    directory, name_pattern = os.path.split(pattern)
+    if not glob.has_magic(directory):
+        # glob matches case-insensitively on Windows
+        match = re.compile(fnmatch.translate(name_pattern), re.IGNORECASE if os.name == 'nt' else 0).match
+        # Like glob, wildcards only match hidden files when the pattern itself starts with '.'
+        include_hidden = name_pattern.startswith('.')
+        try:
+            with os.scandir(directory or '.') as entries:
+                for entry in entries:
+                    name = entry.name
+                    if (include_hidden or not name.startswith('.')) and match(name) and entry.is_file():
+                        yield os.path.join(directory, name)
+        except OSError:
+            return
+        return
+    for path in glob.iglob(pattern):
+        if os.path.isfile(path):
+            yield path
+
+
+def adjust_remote_object_path(local_source: str, object_path: str, local_basename: str = None) -> str:
     """
     Adjusts the remote object path for single file uploads based on destination format.
+    local_basename may be passed when the caller has already computed it.
     """
-    local_basename = os.path.basename(local_source)
+    if local_basename is None:
+        local_basename = os.path.basename(local_source)
     # If destination is empty (oc://bucket) or ends with '/' (oc://bucket/prefix/)
-    if not object_path or object_path.endswith('/'):
+    if not object_path or object_path[-1] == '/':
         return object_path + local_basename
-    # If destination looks like a file path already
-    # (This check might need refinement depending on desired gsutil parity)
-    # A simple check: if it contains the basename already, assume it's intentional.
-    # Otherwise, treat the destination as a prefix.
-    elif '/' in object_path and not object_path.endswith('/' + local_basename):
-        # Check if the last part of object_path might be intended as filename
-        _, potential_ext = os.path.splitext(object_path)
-        if not potential_ext: # Treat as prefix if no extension
-             return object_path.rstrip('/') + '/' + local_basename
-    # Default: Assume object_path is the intended full remote filename
-    return object_path
+    # The last component alone decides: the source's own name or anything with an
+    # extension is the intended remote filename, everything else is a prefix.
+    last_component = object_path[object_path.rfind('/') + 1:]
+    if last_component == local_basename or os.path.splitext(last_component)[1]:
+        return object_path
+    return object_path + '/' + local_basename
+
+
+class _DryRunObjectStorage:
+    """Stands in for the Object Storage client during dry runs; any API call is a bug."""
+
+    def __getattr__(self, name):
+        raise RuntimeError(f"Object Storage '{name}' must not be called during a dry run.")
+
+
+class _DryRunManager:
+    """
+    Minimal OCIManager replacement for dry-run uploads, which only log what they would send.
+    Avoids parsing the OCI config, loading the API key and looking up the namespace.
+    """
+
+    def __init__(self, config_profile='DEFAULT'):
+        self.config_profile = config_profile
+        self.namespace = "<dry-run>"
+        self.object_storage = _DryRunObjectStorage()
+
+    def configure_connection_pool(self, pool_size: int):
+        pass
+
+    def note_service_error(self, error):
+        pass
+
+
+def _is_dry_run_upload(args) -> bool:
+    """True for 'cp --dry-run' from a local source to an oc:// destination that needs no listing."""
+    return (args.command == 'cp' and args.dry_run and not args.skip_existing
+            and not is_remote_path(args.source) and is_remote_path(args.destination))
+
+
+def run_native_folder_upload(args, oci_manager: 'OCIManager', bucket_name: str, object_prefix: str,
+                             parallel_count: int, logger: logging.Logger):
+    """
+    Uploads a local folder with the OCI CLI's 'oci os object bulk-upload' (--transfer-backend native).
+    Object names match the Python path: object_prefix/<path relative to the folder>.
+    The key passphrase already entered for oci_manager is handed to the CLI in its environment,
+    so the user is not prompted a second time.
+
+    Returns:
+        True/False for the CLI's success, or None if the 'oci' executable is not installed.
+    """
+    oci_cli = shutil.which("oci")
+    if oci_cli is None:
+        return None
+    command = [
+        oci_cli, "os", "object", "bulk-upload",
+        "--profile", args.config_profile,
+        "--bucket-name", bucket_name,
+        "--src-dir", args.source,
+        "--parallel-upload-count", str(parallel_count),
+        "--no-follow-symlinks",
+        "--overwrite",
+    ]
+    if object_prefix.strip('/'):
+        command += ["--object-prefix", object_prefix.strip('/') + '/']
+    env = None
+    pass_phrase = oci_manager.config.get('pass_phrase')
+    if pass_phrase:
+        env = dict(os.environ, OCI_CLI_PASSPHRASE=pass_phrase)
+    logger.debug("Running: %s", subprocess.list2cmdline(command))
+    flush_logging()
+    return subprocess.run(command, env=env).returncode == 0
+
+
+class _CpWorkers:
+    """
+    Worker count and worker pool of one 'cp' command.
+    Single-object copies use the base count (--parallel, or the CPU count) for their ranged
+    parts and never start the pool. The RTT probe behind the default bulk count and the pool
+    itself are only set up once a bulk transfer asks for them (see bulk_executor).
+    """
+
+    def __init__(self, args, oci_manager: 'OCIManager'):
+        self.args = args
+        self.oci_manager = oci_manager
+        self.parallel_count = max(1, args.parallel) if args.parallel is not None else multiprocessing.cpu_count()
+        # An explicit --parallel wins; dry runs have no endpoint to probe
+        self._count_resolved = args.parallel is not None or isinstance(oci_manager, _DryRunManager)
+        self.executor = None
+        self._configure_connection_pool()
+
+    def _configure_connection_pool(self):
+        # Every worker shares one client; size its pool so idle connections are kept for reuse.
+        # Each worker may be moving the ranged/multipart parts of one large file, so the pool
+        # holds a connection per part (at least two per worker).
+        part_parallel_count = self.args.parallel_parts or multiprocessing.cpu_count()
+        self.oci_manager.configure_connection_pool(self.parallel_count * max(2, part_parallel_count))
+
+    def bulk_parallel_count(self, bucket_name: str) -> int:
+        """
+        Returns the worker count for a bulk transfer to or from bucket_name. Without --parallel
+        it is derived once from the measured round trip to the bucket (see ocutil.utils.concurrency).
+        """
+        if not self._count_resolved:
+            from ocutil.utils.concurrency import default_parallel_count
+            self.parallel_count = default_parallel_count(self.oci_manager, bucket_name)
+            self._count_resolved = True
+            self._configure_connection_pool()
+        return self.parallel_count
+
+    def bulk_executor(self, bucket_name: str) -> concurrent.futures.Executor:
+        """Returns the pool shared by the bulk transfers of this command, creating it on first use."""
+        if self.executor is None:
+            from ocutil.utils.concurrency import create_executor
+            parallel_count = self.bulk_parallel_count(bucket_name)
+            # Dry runs transfer nothing, so they never need worker processes
+            backend = 'thread' if self.args.dry_run else self.args.workers_backend
+            self.executor = create_executor(backend, parallel_count, self.oci_manager)
+        return self.executor
+
+    def shutdown(self, cancel: bool = False):
+        if self.executor is not None:
+            self.executor.shutdown(wait=not cancel, cancel_futures=cancel)
+
+
+def classify_remote_source(oci_manager: 'OCIManager', bucket_name: str, object_path: str):
+    """
+    Decides whether object_path names a single object or a folder prefix using list_objects.
+    Listings are sorted by name, so an exact match is always the first entry returned.
+
+    Returns:
+        source_type (str|None): 'file', 'folder', or None if nothing exists at the path.
+        object_size (int|None): Size of the object when source_type is 'file'.
+    """
+    object_storage = oci_manager.object_storage
+    objects = object_storage.list_objects(
+        oci_manager.namespace, bucket_name, prefix=object_path, limit=2, fields="name,size"
+    ).data.objects or []
+    if objects and objects[0].name == object_path:
+        return 'file', objects[0].size
+    folder_prefix = object_path + '/'
+    if any(obj.name.startswith(folder_prefix) for obj in objects):
+        return 'folder', None
+    if len(objects) < 2:
+        return None, None
+    # Names such as 'path-x' sort before 'path/'; ask for the folder prefix directly
+    objects = object_storage.list_objects(
+        oci_manager.namespace, bucket_name, prefix=folder_prefix, limit=1, fields="name"
+    ).data.objects
+    return ('folder', None) if objects else (None, None)
 
 
 # --- CP Command Handler (Contains logic moved from previous main) ---
-def handle_cp_command(args, oci_manager: OCIManager, logger: logging.Logger):
+def handle_cp_command(args, oci_manager: 'OCIManager', logger: logging.Logger):
     """Handles the logic for the 'cp' command."""
-    parallel_count = max(1, args.parallel) # Ensure at least one thread
+    workers = _CpWorkers(args, oci_manager)
+    try:
+        _run_cp_command(args, oci_manager, logger, workers)
+    except BaseException:
+        # Ctrl+C or an aborted command: drop queued transfers instead of waiting for all of them;
+        # only the transfers already running are finished
+        workers.shutdown(cancel=True)
+        raise
+    workers.shutdown()
+
+
+def _run_cp_command(args, oci_manager: 'OCIManager', logger: logging.Logger, workers: _CpWorkers):
+    """Body of 'cp': classifies source/destination and dispatches to the Downloader or Uploader."""
+    import oci
+
+    # Evaluated once; each side's remoteness is consulted several times below
+    src_remote = args.source.startswith(_OC_SCHEME)
+    dst_remote = args.destination.startswith(_OC_SCHEME)
 
     # --- Download Operation ---
-    if is_remote_path(args.source):
-        if is_remote_path(args.destination):
+    if src_remote:
+        if dst_remote:
              logger.error("Invalid 'cp' command: Both source and destination cannot be remote paths.")
              sys.exit(1)
         # ... (rest of download logic from previous version) ...
         remote_path = args.source
         local_destination = args.destination
         # (Create local dir, check file/folder, call downloader...)
+        # makedirs alone covers "missing" and "already a directory"; only a clash with a file
+        # needs a second look
         try:
-             if not os.path.exists(local_destination):
-                 logger.info(f"Destination directory '{local_destination}' does not exist. Creating it.")
-                 os.makedirs(local_destination, exist_ok=True)
-             elif not os.path.isdir(local_destination):
-                 logger.error(f"Destination path '{local_destination}' exists but is not a directory.")
-                 sys.exit(1)
+             os.makedirs(local_destination, exist_ok=True)
+        except FileExistsError:
+             logger.error("Destination path '%s' exists but is not a directory.", local_destination)
+             sys.exit(1)
         except OSError as e:
-              logger.error(f"Failed to create destination directory '{local_destination}': {e}")
+              logger.error("Failed to create destination directory '%s': %s", local_destination, e)
               sys.exit(1)
 
-        downloader = Downloader(oci_manager=oci_manager, dry_run=args.dry_run)
+        from ocutil.utils.downloader import Downloader
+        downloader = Downloader(oci_manager=oci_manager, dry_run=args.dry_run,
+                                part_parallel_count=args.parallel_parts, adaptive=args.adaptive,
+                                skip_existing=args.skip_existing)
         try:
             bucket_name, object_path = parse_remote_path(remote_path)
         except ValueError as e:
-             logger.error(f"Invalid source OCI path format: {e}")
+             logger.error("Invalid source OCI path format: %s", e)
              sys.exit(1)
 
-        is_folder_download = False
-        is_single_file_download = False
+        source_type = None # 'file' or 'folder' once known
+        object_size = None
+        operation_successful = None
+        local_file_path = os.path.join(local_destination, os.path.basename(object_path))
         # (Logic to determine if single file or folder download...)
         if not object_path:
-             is_folder_download = True
-             logger.info(f"Source path is bucket root, treating as full bucket download.")
+             source_type = 'folder'
+             logger.info("Source path is bucket root, treating as full bucket download.")
         elif object_path.endswith('/'):
-            is_folder_download = True
-            logger.info(f"Source path ends with '/', treating as folder download: '{object_path}'")
-        else:
-            # (head_object / list_objects check...)
+            source_type = 'folder'
+            logger.info("Source path ends with '/', treating as folder download: '%s'", object_path)
+        elif not args.dry_run and os.path.splitext(object_path)[1].lower() in _COMMON_FILE_EXTENSIONS:
+            # Almost certainly an object: download it directly and only probe if it turns out not to exist
+            logger.info("Initiating single file download: '%s' -> '%s'.", remote_path, local_file_path)
+            operation_successful = downloader.download_single_file(
+                bucket_name, object_path, local_file_path, parallel_count=workers.parallel_count, not_found_ok=True
+            )
+            if operation_successful is None:
+                logger.debug("'%s' is not an object; checking whether it is a prefix...", object_path)
+
+        if source_type is None and operation_successful is None:
+            # One listing call classifies the path instead of a head_object that 404s for folders
             try:
-                logger.debug(f"Checking if '{object_path}' is a single object...")
-                oci_manager.object_storage.head_object(oci_manager.namespace, bucket_name, object_path)
-                is_single_file_download = True
-                logger.info(f"Source path '{object_path}' matches a single object.")
+                logger.debug("Checking whether '%s' is an object or a prefix...", object_path)
+                source_type, object_size = classify_remote_source(oci_manager, bucket_name, object_path)
             except oci.exceptions.ServiceError as e:
-                if e.status == 404:
-                    logger.debug(f"'{object_path}' not found as a single object (404). Checking if it's a prefix...")
-                    list_response = oci_manager.object_storage.list_objects(
-                        oci_manager.namespace, bucket_name, prefix=object_path, limit=1, fields="name"
-                    )
-                    if list_response.data.objects:
-                         is_folder_download = True
-                         logger.info(f"Source path '{object_path}' is not a single object but matches existing object prefixes. Treating as folder download.")
-                    else:
-                         logger.error(f"Source path '{remote_path}' does not exist as an object or a valid prefix.")
-                         sys.exit(1)
-                else:
-                     logger.error(f"Error checking source path '{remote_path}': {e.status} - {e.message}")
-                     sys.exit(1)
+                 oci_manager.note_service_error(e)
+                 logger.error("Error checking source path '%s': %s - %s", remote_path, e.status, e.message)
+                 sys.exit(1)
             except Exception as e:
-                 logger.error(f"Unexpected error checking source path '{remote_path}': {e}")
+                 logger.error("Unexpected error checking source path '%s': %s", remote_path, e)
                  sys.exit(1)
+            if source_type == 'file':
+                logger.info("Source path '%s' matches a single object.", object_path)
+            elif source_type == 'folder':
+                logger.info("Source path '%s' is not a single object but matches existing object prefixes. Treating as folder download.", object_path)
+            else:
+                logger.error("Source path '%s' does not exist as an object or a valid prefix.", remote_path)
+                sys.exit(1)
 
-        operation_successful = False
-        if is_single_file_download:
-            local_file_path = os.path.join(local_destination, os.path.basename(object_path))
-            logger.info(f"Initiating single file download: '{remote_path}' -> '{local_file_path}'.")
-            operation_successful = downloader.download_single_file(bucket_name, object_path, local_file_path)
-        elif is_folder_download:
-            logger.info(f"Initiating bulk download with {parallel_count} parallel threads: '{remote_path}' -> '{local_destination}/'.")
-            downloader.download_folder(bucket_name, object_path, local_destination, parallel_count=parallel_count)
-            operation_successful = True # Assume success unless downloader logged errors
-        else:
-             logger.error(f"Could not determine download type for '{remote_path}'.")
-             sys.exit(1)
+        if source_type == 'file':
+            logger.info("Initiating single file download: '%s' -> '%s'.", remote_path, local_file_path)
+            operation_successful = downloader.download_single_file(
+                bucket_name, object_path, local_file_path, object_size=object_size, parallel_count=workers.parallel_count
+            )
+        elif source_type == 'folder':
+            downloader.executor = workers.bulk_executor(bucket_name)
+            parallel_count = workers.parallel_count
+            logger.info("Initiating bulk download with %d parallel threads: '%s' -> '%s/'.", parallel_count, remote_path, local_destination)
+            operation_successful = downloader.download_folder(bucket_name, object_path, local_destination, parallel_count=parallel_count)
 
         if not operation_successful:
              logger.error("Download operation finished with errors.")
@@ -196,51 +505,54 @@ def handle_cp_command(args, oci_manager: OCIManager, logger: logging.Logger):
 
 
     # --- Upload Operation ---
-    elif is_remote_path(args.destination):
-        if is_remote_path(args.source):
+    elif dst_remote:
+        if src_remote:
              logger.error("Invalid 'cp' command: Both source and destination cannot be remote paths.")
              sys.exit(1)
         # ... (rest of upload logic from previous version) ...
         local_source = args.source
         remote_destination = args.destination
         # (Handle wildcards, single file, folder, call uploader...)
-        uploader = Uploader(oci_manager=oci_manager, dry_run=args.dry_run)
+        from ocutil.utils.uploader import Uploader
+        uploader = Uploader(oci_manager=oci_manager, dry_run=args.dry_run, part_parallel_count=args.parallel_parts,
+                            skip_existing=args.skip_existing)
         try:
             bucket_name, object_path = parse_remote_path(remote_destination)
         except ValueError as e:
-            logger.error(f"Error parsing remote destination path: {e}")
+            logger.error("Error parsing remote destination path: %s", e)
             sys.exit(1)
 
+        # Computed once and shared by the single-file and folder branches below
+        source_basename = os.path.basename(os.path.normpath(local_source))
+
         # (Wildcard check...)
-        if '*' in local_source or '?' in local_source or '[' in local_source:
-             logger.info(f"Source '{local_source}' contains wildcard characters. Expanding matches...")
-             # (glob logic...)
-             files_matched = glob.glob(local_source)
-             if not files_matched:
-                 logger.error(f"No local files matched the pattern: {local_source}")
-                 sys.exit(1)
-             files_to_upload = [f for f in files_matched if os.path.isfile(f)]
-             if not files_to_upload:
-                 logger.error(f"Pattern '{local_source}' matched only directories or non-file items. Nothing to upload.")
+        if _WILDCARD_RE.search(local_source):
+             logger.info("Source '%s' contains wildcard characters. Expanding matches...", local_source)
+             # Matches are streamed into the upload pool while the pattern is still being expanded
+             files_to_upload = iter_wildcard_matches(local_source)
+             first_match = next(files_to_upload, None)
+             if first_match is None:
+                 logger.error("No local files matched the pattern: %s", local_source)
                  sys.exit(1)
-             # (Build upload list...)
-             logger.info(f"Found {len(files_to_upload)} files matching pattern to upload.")
-             upload_list = []
-             # (Determine final object name based on destination...)
-             for file_path in files_to_upload:
-                  local_basename = os.path.basename(file_path)
-                  # Treat destination as prefix for wildcard uploads
-                  prefix = object_path.rstrip('/') + '/' if object_path else ''
-                  final_object_name = prefix + local_basename
-                  upload_list.append((file_path, final_object_name))
-                  logger.debug(f"Queueing wildcard match: '{file_path}' -> '{final_object_name}'")
-
-             uploader.upload_files(upload_list, bucket_name, parallel_count=parallel_count)
+             # Treat destination as prefix for wildcard uploads
+             prefix = object_path.rstrip('/') + '/' if object_path else ''
+             # Bound once: the generator below runs once per matched file
+             basename = os.path.basename
+             add_prefix = prefix.__add__
+             upload_list = (
+                 (file_path, add_prefix(basename(file_path)))
+                 for file_path in itertools.chain((first_match,), files_to_upload)
+             )
+
+             uploader.executor = workers.bulk_executor(bucket_name)
+             if not uploader.upload_files(upload_list, bucket_name, parallel_count=workers.parallel_count):
+                  logger.error("Upload operation finished with errors.")
+                  sys.exit(1)
 
         elif os.path.isfile(local_source):
              # (Single file upload...)
-             final_object_path = adjust_remote_object_path(local_source, object_path)
-             logger.info(f"Initiating single file upload: '{local_source}' -> 'oc://{bucket_name}/{final_object_path}'.")
+             final_object_path = adjust_remote_object_path(local_source, object_path, local_basename=source_basename)
+             logger.info("Initiating single file upload: '%s' -> 'oc://%s/%s'.", local_source, bucket_name, final_object_path)
              operation_successful = uploader.upload_single_file(local_source, bucket_name, final_object_path)
              if not operation_successful:
                   logger.error("Upload operation finished with errors.")
@@ -249,13 +561,28 @@ def handle_cp_command(args, oci_manager: OCIManager, logger: logging.Logger):
              # (Folder upload...)
              final_object_prefix = object_path
              if not final_object_prefix:
-                   final_object_prefix = os.path.basename(os.path.normpath(local_source))
-                   logger.info(f"No remote prefix specified, using source directory name as prefix: '{final_object_prefix}'")
-
-             logger.info(f"Initiating bulk upload of folder '{local_source}' with {parallel_count} parallel threads to 'oc://{bucket_name}/{final_object_prefix}/'.")
-             uploader.upload_folder(local_source, bucket_name, final_object_prefix, parallel_count=parallel_count)
+                   final_object_prefix = source_basename
+                   logger.info("No remote prefix specified, using source directory name as prefix: '%s'", final_object_prefix)
+
+             if args.transfer_backend == 'native' and not args.dry_run:
+                  logger.info("Uploading folder '%s' to 'oc://%s/%s/' with the OCI CLI.", local_source, bucket_name, final_object_prefix)
+                  native_result = run_native_folder_upload(args, oci_manager, bucket_name, final_object_prefix,
+                                                           workers.bulk_parallel_count(bucket_name), logger)
+                  if native_result is not None:
+                       if not native_result:
+                            logger.error("Upload operation finished with errors.")
+                            sys.exit(1)
+                       return
+                  logger.warning("The 'oci' CLI was not found on PATH; falling back to the built-in uploader.")
+
+             uploader.executor = workers.bulk_executor(bucket_name)
+             parallel_count = workers.parallel_count
+             logger.info("Initiating bulk upload of folder '%s' with %d parallel threads to 'oc://%s/%s/'.", local_source, parallel_count, bucket_name, final_object_prefix)
+             if not uploader.upload_folder(local_source, bucket_name, final_object_prefix, parallel_count=parallel_count):
+                  logger.error("Upload operation finished with errors.")
+                  sys.exit(1)
         else:
-             logger.error(f"Local source path '{local_source}' is not a valid file, directory, or wildcard pattern.")
+             logger.error("Local source path '%s' is not a valid file, directory, or wildcard pattern.", local_source)
              sys.exit(1)
 
     # --- Invalid Local/Local cp Command ---
@@ -266,10 +593,12 @@ def handle_cp_command(args, oci_manager: OCIManager, logger: logging.Logger):
     logger.info("cp command finished.") # Info log for completion of cp
 
 
-# --- Main execution block ---
-def main():
+# --- Argument Parser ---
+def _build_parser() -> argparse.ArgumentParser:
+    """Builds the ocutil argument parser (top-level options plus the cp and ls sub-commands)."""
     parser = argparse.ArgumentParser(
         description="ocutil: Oracle Cloud Object Storage CLI.",
+        allow_abbrev=False, # Options must be spelled out; also skips argparse's prefix matching
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""Examples:
   ocutil cp local_file.txt oc://my-bucket/remote_file.txt
@@ -290,43 +619,87 @@ def main():
                                        help="Available commands: cp, ls") # List commands
 
     # --- CP Sub-command Parser ---
-    cp_parser = subparsers.add_parser('cp', help='Copy files/objects between local and OCI Object Storage.')
+    cp_parser = subparsers.add_parser('cp', help='Copy files/objects between local and OCI Object Storage.',
+                                      allow_abbrev=False)
     cp_parser.add_argument("source", help="Source path (local or oc://...). Wildcards allowed for local source.")
     cp_parser.add_argument("destination", help="Destination path (local or oc://...).")
-    cp_parser.add_argument("--parallel", type=int, default=multiprocessing.cpu_count(),
-                        help="Number of parallel threads for bulk operations (default: number of CPUs)")
+    cp_parser.add_argument("--parallel", type=int, default=None,
+                        help="Number of parallel threads for bulk operations "
+                             "(default: number of CPUs, raised up to 2x CPUs for bulk transfers when the measured "
+                             "round-trip time and OCUTIL_BANDWIDTH_MBPS call for more requests in flight)")
+    cp_parser.add_argument("--parallel-parts", type=int, default=None,
+                        help="Number of parts of one large file transferred concurrently: multipart uploads over 128 MiB "
+                             "and ranged downloads over 32 MiB within a folder download (default: number of CPUs)")
+    cp_parser.add_argument("--adaptive", action="store_true",
+                        help="For folder downloads, halve the number of objects in flight on throttling, server "
+                             "errors or timeouts, and grow it back (up to --parallel) while throughput holds up")
+    cp_parser.add_argument("--workers-backend", choices=("thread", "process"), default="thread",
+                        help="Run bulk transfers in worker threads sharing one client, or in worker processes "
+                             "with a client each (default: thread)")
+    cp_parser.add_argument("--transfer-backend", choices=("python", "native"), default="python",
+                        help="Upload folders with the built-in uploader, or with 'oci os object bulk-upload' "
+                             "when the OCI CLI is installed (default: python). The native backend overwrites "
+                             "existing objects and cannot be combined with --skip-existing")
+    cp_parser.add_argument("--skip-existing", action="store_true",
+                        help="Skip files already at the destination: wildcard and folder uploads compare "
+                             "size and MD5 (for multipart objects, the per-part MD5 at ocutil's part size); "
+                             "folder downloads compare size and then modification time or MD5 (multipart "
+                             "objects without a newer local copy are downloaded again)")
     cp_parser.add_argument("--dry-run", action="store_true", help="Simulate actions without transferring data")
 
     # --- LS Sub-command Parser ---
-    ls_parser = subparsers.add_parser('ls', help='List objects and prefixes in OCI Object Storage.')
+    ls_parser = subparsers.add_parser('ls', help='List objects and prefixes in OCI Object Storage.',
+                                      allow_abbrev=False)
     ls_parser.add_argument("oci_path", help="OCI path (e.g., oc://bucket-name/prefix/). Use oc://bucket-name/ to list bucket root.")
     ls_parser.add_argument("-l", "--long", action="store_true", help="Display long format including size and modification time.")
     ls_parser.add_argument("-H", "--human-readable", action="store_true", help="Display sizes in human-readable format (KiB, MiB, etc.). Requires -l.")
     ls_parser.add_argument("-r", "--recursive", action="store_true", help="Recursively list objects under the prefix.")
 
+    return parser
+
+
+# Built once at import; main() only parses with it
+_PARSER = _build_parser()
+
+
+# --- Main execution block ---
+def main():
     # --- Parse Arguments ---
+    parser = _PARSER
     args = parser.parse_args()
+    if args.command == 'cp' and args.transfer_backend == 'native' and args.skip_existing:
+        # bulk-upload can only skip by object name, not by size and MD5
+        parser.error("--skip-existing cannot be used with --transfer-backend native")
 
     # --- Setup ---
     logger = setup_logging(log_file=args.log_file, verbose=args.verbose)
 
-    try:
-        # Initialize OCI Manager (common for all commands)
-        logger.debug(f"Initializing OCIManager with profile: {args.config_profile}")
-        oci_manager = OCIManager(config_profile=args.config_profile)
-        logger.debug(f"Using OCI Namespace: {oci_manager.namespace}")
-    except oci.exceptions.ConfigFileNotFound as e:
-         logger.error(f"OCI Configuration Error: {e}. Please ensure ~/.oci/config exists and is configured.")
-         sys.exit(1)
-    except oci.exceptions.MissingConfigValue as e:
-         logger.error(f"OCI Configuration Error: Missing value in profile '{args.config_profile}'. {e}")
-         sys.exit(1)
-    except Exception as ex:
-        logger.error(f"Failed to initialize OCI Manager: {ex}", exc_info=args.verbose)
-        sys.exit(1)
+    import oci
+    from ocutil.utils.oci_manager import OCIManager
+
+    if _is_dry_run_upload(args):
+        # Nothing is sent to OCI, so skip loading the config, the API key and the namespace lookup
+        logger.debug("Dry-run upload: not initializing OCIManager.")
+        oci_manager = _DryRunManager(config_profile=args.config_profile)
+    else:
+        try:
+            # Initialize OCI Manager (common for all commands)
+            logger.debug("Initializing OCIManager with profile: %s", args.config_profile)
+            oci_manager = OCIManager(config_profile=args.config_profile)
+            logger.debug("Using OCI Namespace: %s", oci_manager.namespace)
+        except oci.exceptions.ConfigFileNotFound as e:
+             logger.error("OCI Configuration Error: %s. Please ensure ~/.oci/config exists and is configured.", e)
+             sys.exit(1)
+        except oci.exceptions.InvalidConfig as e:
+             logger.error("OCI Configuration Error: Invalid or missing value in profile '%s'. %s", args.config_profile, e)
+             sys.exit(1)
+        except Exception as ex:
+            logger.error("Failed to initialize OCI Manager: %s", ex, exc_info=args.verbose)
+            sys.exit(1)
 
     # --- Dispatch to Command Handler ---
-    start_time = time.time()
+    # The completion time is only logged at DEBUG, so it is only measured under --verbose
+    start_ns = time.monotonic_ns() if args.verbose else None
     try:
         if args.command == 'cp':
             # Call the 'cp' handler
@@ -335,6 +708,7 @@ def main():
             # Handle 'ls' command by creating Lister and calling its method
             try:
                 bucket_name, prefix = parse_remote_path(args.oci_path)
+                from ocutil.utils.lister import Lister
                 lister = Lister(oci_manager)
                 lister.list_path(
                     bucket_name=bucket_name,
@@ -345,32 +719,39 @@ def main():
                 )
             except ValueError as e:
                 # Catch path parsing errors specific to ls path format
-                logger.error(f"Invalid OCI path format for 'ls': {e}")
+                logger.error("Invalid OCI path format for 'ls': %s", e)
                 sys.exit(1)
             # Note: OCI API/listing errors are handled within lister.list_path now
         else:
             # This case should not be reached due to 'required=True' in add_subparsers
-            logger.error(f"Internal error: Unknown command '{args.command}'")
+            logger.error("Internal error: Unknown command '%s'", args.command)
             parser.print_help()
             sys.exit(1)
 
         # Log overall completion time at DEBUG level
-        end_time = time.time()
-        logger.debug(f"Command '{args.command}' completed successfully in {end_time - start_time:.2f} seconds.")
+        if start_ns is not None:
+            logger.debug("Command '%s' completed successfully in %.2f seconds.",
+                         args.command, (time.monotonic_ns() - start_ns) / 1e9)
 
+    except oci.exceptions.ServiceError as e:
+         oci_manager.note_service_error(e)
+         logger.error("OCI Service Error: %s - %s", e.status, e.message)
+         sys.exit(1)
     except oci.exceptions.RequestException as e:
          # Catch OCI request errors that might propagate up (though handlers should catch most)
-         logger.error(f"OCI API Request Error: {e.status} - {e.message}")
+         logger.error("OCI API Request Error: %s - %s", e.status, e.message)
          if args.verbose and hasattr(e, 'headers') and e.headers.get('opc-request-id'):
-              logger.debug(f"OCI Request ID: {e.headers.get('opc-request-id')}")
+              logger.debug("OCI Request ID: %s", e.headers.get('opc-request-id'))
          sys.exit(1)
     except KeyboardInterrupt:
          logger.warning("Operation interrupted by user (Ctrl+C).")
          sys.exit(130) # Standard exit code for Ctrl+C
     except Exception as ex:
         # Catch any other unexpected errors during command execution
-        logger.error(f"An unexpected error occurred during command execution: {ex}", exc_info=args.verbose)
+        logger.error("An unexpected error occurred during command execution: %s", ex, exc_info=args.verbose)
         sys.exit(1)
+    finally:
+        flush_logging()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
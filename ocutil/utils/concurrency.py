@@ -0,0 +1,264 @@
+import os
+import time
+import logging
+import multiprocessing
+import concurrent.futures
+import multiprocessing.util
+import logging.handlers
+
+logger = logging.getLogger('ocutil.concurrency')
+
+# Assumed link bandwidth when estimating how many transfers keep the pipe full
+DEFAULT_BANDWIDTH_MBPS = 1000
+# Bytes each worker has in flight per request (matches the ranged/multipart part size)
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+# Lowest cap on the default worker count, so machines with very few CPUs can still reach it
+MIN_PARALLEL_COUNT = 4
+# Longest round trip expected from an Object Storage endpoint. When the bandwidth-delay product
+# would only exceed the CPU count at a longer RTT, the probe cannot change the count and is skipped.
+MAX_EXPECTED_RTT = 0.5 # seconds
+# Completed transfers per in-flight slot that make up one AdaptiveConcurrencyLimit sample
+SAMPLE_COMPLETIONS_PER_SLOT = 3
+# Values accepted by 'cp --workers-backend'
+WORKER_BACKENDS = ('thread', 'process')
+
+# Per-process state of the 'process' backend, set up by _init_worker_process
+_process_manager = None
+_process_transfers = {}
+
+
+def _bandwidth_bytes_per_second() -> float:
+    """Reads OCUTIL_BANDWIDTH_MBPS (megabits per second), falling back to DEFAULT_BANDWIDTH_MBPS."""
+    try:
+        mbps = float(os.environ.get("OCUTIL_BANDWIDTH_MBPS", DEFAULT_BANDWIDTH_MBPS))
+    except ValueError:
+        mbps = DEFAULT_BANDWIDTH_MBPS
+    return max(mbps, 1.0) * 1_000_000 / 8
+
+
+def measure_rtt(oci_manager, bucket_name: str):
+    """
+    Estimates the round trip to the Object Storage endpoint by timing a head_bucket call.
+    An untimed call goes first so the timed one reuses a warm connection: the TCP and TLS
+    handshakes of a fresh connection would otherwise be counted as round-trip time.
+    Both calls are made once, without the client's retry strategy, so a throttled or failing
+    endpoint cannot hold up the transfer while the probe backs off.
+    Returns: float seconds, or None if the probe failed.
+    """
+    import oci
+    no_retry = oci.retry.NoneRetryStrategy()
+    try:
+        oci_manager.object_storage.head_bucket(oci_manager.namespace, bucket_name, retry_strategy=no_retry)
+        start = time.monotonic()
+        oci_manager.object_storage.head_bucket(oci_manager.namespace, bucket_name, retry_strategy=no_retry)
+        return time.monotonic() - start
+    except Exception as e:
+        logger.debug("RTT probe against bucket '%s' failed: %s", bucket_name, e)
+        return None
+
+
+def pick_parallel_count(rtt_seconds, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Picks a worker count from the CPU count and the bandwidth-delay product.
+    Small-file transfers are bound by request count rather than bandwidth, so the CPU count
+    is the floor; high-latency or fast links that need more requests in flight to cover
+    bandwidth * RTT get up to twice the CPU count.
+    """
+    cpu_count = multiprocessing.cpu_count()
+    upper = max(MIN_PARALLEL_COUNT, cpu_count * 2)
+    if rtt_seconds is None:
+        return cpu_count
+    bdp_workers = int(_bandwidth_bytes_per_second() * rtt_seconds / chunk_size)
+    return min(upper, max(cpu_count, bdp_workers))
+
+
+def default_parallel_count(oci_manager, bucket_name: str) -> int:
+    """
+    Returns the parallel count used for bulk transfers when --parallel is not given on the command line.
+    The RTT is only probed when the bandwidth-delay product could exceed the CPU count at a
+    round trip of up to MAX_EXPECTED_RTT, e.g. with a high OCUTIL_BANDWIDTH_MBPS.
+    """
+    cpu_count = multiprocessing.cpu_count()
+    rtt_to_exceed_cpu_count = (cpu_count + 1) * DEFAULT_CHUNK_SIZE / _bandwidth_bytes_per_second()
+    if rtt_to_exceed_cpu_count > MAX_EXPECTED_RTT:
+        return cpu_count
+    rtt = measure_rtt(oci_manager, bucket_name)
+    parallel_count = pick_parallel_count(rtt)
+    if rtt is not None:
+        logger.debug("Measured RTT %.1f ms; using %s parallel workers.", rtt * 1000, parallel_count)
+    return parallel_count
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    AIMD controller for the number of transfers kept in flight.
+    The limit is halved when transfers report congestion (throttling, server errors or
+    timeouts), at most once per sample window. Otherwise it grows back by one slot per window
+    (up to `maximum`) while the smoothed throughput holds up.
+    Throughput alone never lowers the limit: with mixed object sizes the completed-bytes rate
+    of one window is mostly noise. Each window's rate is folded into an exponentially weighted
+    moving average (weight `smoothing` for the newest window), and growth pauses while that
+    average is more than `tolerance` below its previous value.
+    Bytes are only known when a transfer completes, so a window spans at least `interval`
+    seconds and SAMPLE_COMPLETIONS_PER_SLOT completions per slot (a few average transfer durations).
+    """
+
+    def __init__(self, maximum: int, interval: float = 1.0, tolerance: float = 0.05, smoothing: float = 0.3):
+        self.maximum = max(1, maximum)
+        self.limit = self.maximum
+        self.interval = interval
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self._smoothed_rate = None
+        self._backed_off = False
+        self._start_window(time.monotonic())
+
+    def _start_window(self, now: float):
+        self._bytes = 0
+        self._completions = 0
+        self._window_start = now
+
+    def record(self, nbytes: int):
+        """Counts a completed transfer of nbytes towards the current sample."""
+        self._bytes += nbytes
+        self._completions += 1
+
+    def record_congestion(self):
+        """
+        Halves the limit for a transfer that hit throttling, a server error or a timeout.
+        Transfers started before the cut report their congestion too, so further reports in
+        the same window are ignored; the window restarts to measure the new limit.
+        """
+        if self._backed_off:
+            return
+        self.limit = max(1, self.limit // 2)
+        self._backed_off = True
+        self._start_window(time.monotonic())
+        logger.debug("Congestion reported; in-flight limit %d.", self.limit)
+
+    def update(self) -> int:
+        """Closes the current sample once it is long enough and returns the (possibly new) limit."""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.interval or self._completions < self.limit * SAMPLE_COMPLETIONS_PER_SLOT:
+            return self.limit
+        rate = self._bytes / elapsed
+        previous = self._smoothed_rate
+        self._smoothed_rate = rate if previous is None else self.smoothing * rate + (1 - self.smoothing) * previous
+        if not self._backed_off and previous is not None and self._smoothed_rate >= previous * (1 - self.tolerance):
+            self.limit = min(self.maximum, self.limit + 1)
+        logger.debug("Throughput %.1f MB/s (smoothed %.1f MB/s); in-flight limit %d.",
+                     rate / 1_000_000, self._smoothed_rate / 1_000_000, self.limit)
+        self._backed_off = False
+        self._start_window(now)
+        return self.limit
+
+
+def _init_worker_process(config_profile: str, config: dict, namespace: str, log_level: int):
+    """Builds the OCIManager of one worker process from the parent's already loaded config."""
+    global _process_manager
+    # Spawned workers start without the parent's handlers; log to stderr at the same level
+    logging.basicConfig(level=log_level, format='%(asctime)s [%(levelname)s] %(processName)s %(name)s: %(message)s')
+    from ocutil.utils.oci_manager import OCIManager
+    _process_manager = OCIManager(config_profile, config=config, namespace=namespace)
+
+
+def _flush_log_handlers(listeners=()):
+    """Flushes the root and 'ocutil' handlers, and the handlers behind the given QueueListeners."""
+    handlers = logging.getLogger().handlers + logging.getLogger('ocutil').handlers
+    for listener in listeners:
+        handlers += listener.handlers
+    for handler in handlers:
+        handler.flush()
+
+
+def _root_queue_listeners():
+    """QueueListeners behind the root logger's QueueHandlers (set up as handler.listener)."""
+    return [handler.listener for handler in logging.getLogger().handlers
+            if isinstance(handler, logging.handlers.QueueHandler) and getattr(handler, 'listener', None)]
+
+
+def _use_listener_handlers_directly():
+    """
+    Forked children get a copy of the log queue but not the listener thread draining it,
+    so their records go straight to the listener's handlers instead.
+    """
+    root = logging.getLogger()
+    for listener in _root_queue_listeners():
+        for handler in list(root.handlers):
+            if getattr(handler, 'listener', None) is listener:
+                root.removeHandler(handler)
+        for handler in listener.handlers:
+            root.addHandler(handler)
+
+
+def _init_forked_worker_process(oci_manager):
+    """Adopts the OCIManager inherited from the parent, which already holds the parsed config and signer."""
+    global _process_manager
+    oci_manager.reset_connection_pool()
+    _process_manager = oci_manager
+    _use_listener_handlers_directly()
+    # Worker processes end with os._exit; write out records the inherited handlers still buffer
+    multiprocessing.util.Finalize(None, _flush_log_handlers, exitpriority=0)
+
+
+def _run_in_worker_process(transfer_class, options: tuple, method_name: str, *args):
+    """Runs one transfer method on this process's instance of transfer_class, creating it on first use."""
+    key = (transfer_class, options)
+    transfer = _process_transfers.get(key)
+    if transfer is None:
+        transfer = _process_transfers[key] = transfer_class(_process_manager, **dict(options))
+    return getattr(transfer, method_name)(*args)
+
+
+def create_executor(backend: str, parallel_count: int, oci_manager) -> concurrent.futures.Executor:
+    """
+    Returns the worker pool for one command.
+    'thread' shares the caller's client between threads; 'process' starts parallel_count
+    worker processes, each with its own client, so TLS and hashing work is not bound by the GIL.
+    Where fork is available the workers inherit oci_manager (config, key and signer included)
+    and only get fresh connections; elsewhere they are spawned and rebuild it from its config.
+    """
+    if backend != 'process':
+        return concurrent.futures.ThreadPoolExecutor(max_workers=parallel_count, thread_name_prefix='ocutil')
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=parallel_count,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker_process,
+            initargs=(oci_manager.config_profile, oci_manager.config, oci_manager.namespace,
+                      logging.getLogger('ocutil').getEffectiveLevel()),
+        )
+    # Children copy the parent's log buffers, so empty them first to avoid duplicate records.
+    # Log listener threads are paused so none of them holds a handler lock across the fork;
+    # stopping drains the queue into the listeners' own (buffering) handlers, so those are
+    # flushed too.
+    listeners = _root_queue_listeners()
+    for listener in listeners:
+        listener.stop()
+    _flush_log_handlers(listeners)
+    try:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=parallel_count,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_forked_worker_process,
+            initargs=(oci_manager,),
+        )
+        # Fork pools start every worker on the first submit; do it now, before progress bars
+        # and transfer threads exist in this process
+        executor.submit(int).result()
+    finally:
+        for listener in listeners:
+            listener.start()
+    return executor
+
+
+def submit_transfer(executor: concurrent.futures.Executor, transfer, method_name: str, options: tuple, *args):
+    """
+    Submits transfer.<method_name>(*args) to executor.
+    Process pools cannot receive the transfer object itself (its client holds sockets and locks),
+    so they get its class and constructor options and use a per-process instance instead.
+    """
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        return executor.submit(_run_in_worker_process, type(transfer), options, method_name, *args)
+    return executor.submit(getattr(transfer, method_name), *args)
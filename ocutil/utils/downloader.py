@@ -1,77 +1,516 @@
 import os
 import logging
 import concurrent.futures
+import shutil
 import time
+import contextlib
+import multiprocessing
+import hashlib
+import base64
+import uuid
+import socket
+from typing import Optional
 import oci
 from rich.progress import Progress
-from ocutil.utils.oci_manager import OCIManager
+from ocutil.utils.oci_manager import OCIManager, retried_by_client
+from ocutil.utils.concurrency import submit_transfer, AdaptiveConcurrencyLimit
 
 logger = logging.getLogger('ocutil.downloader')
 
+def _env_int(name: str, default: int) -> int:
+    """Reads a positive integer from the environment, falling back to default."""
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning("Ignoring invalid value for %s: '%s'", name, os.environ.get(name))
+        return default
+    return value if value > 0 else default
+
+# Buffer size used when copying object bodies to disk (override with OCUTIL_DOWNLOAD_BUFFER, in bytes)
+DOWNLOAD_BUFFER_SIZE = _env_int("OCUTIL_DOWNLOAD_BUFFER", 8 * 1024 * 1024)
+# Single objects larger than this are fetched as parallel ranged GETs (override with OCUTIL_PARALLEL_GET_THRESHOLD)
+PARALLEL_GET_THRESHOLD = _env_int("OCUTIL_PARALLEL_GET_THRESHOLD", 32 * 1024 * 1024)
+RANGE_PART_SIZE = 8 * 1024 * 1024
+# Streamed single downloads start with small reads for a responsive progress bar and switch to
+# DOWNLOAD_BUFFER_SIZE reads once they have run for STREAM_RAMP_SECONDS
+STREAM_INITIAL_READ_SIZE = 1024 * 1024
+STREAM_RAMP_SECONDS = 1.0
+# Downloads submitted ahead of the workers, as a multiple of the worker count
+DOWNLOAD_WINDOW_FACTOR = 4
+# Minimum time between refreshes of the bulk download progress bar
+PROGRESS_UPDATE_INTERVAL = 0.05
+# Read size when hashing local files for --skip-existing
+MD5_READ_SIZE = 1024 * 1024
+# Downloads are written to a hidden temporary file with this suffix and renamed into place once complete
+PARTIAL_SUFFIX = ".ocutil-part"
+# Set OCUTIL_DROP_PAGE_CACHE=1 to evict each downloaded file from the page cache once written,
+# so pulling datasets larger than RAM does not push other processes' pages out of memory
+DROP_PAGE_CACHE = os.environ.get("OCUTIL_DROP_PAGE_CACHE", "") not in ("", "0") and hasattr(os, 'posix_fadvise')
+
+
+def _drop_page_cache(fd: int):
+    """
+    Writes fd's data to disk and advises the kernel to drop its cached pages.
+    Dirty pages cannot be dropped, hence the fdatasync first. Failures are ignored: this only frees memory.
+    """
+    try:
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as e:
+        logger.debug("Could not drop cached pages: %s", e)
+
+def _partial_path(local_path: str) -> str:
+    """
+    Temporary path next to local_path for one download. The random component keeps it from
+    colliding with another object's destination (e.g. objects 'a' and 'a.part') or with
+    another ocutil run writing into the same directory.
+    """
+    directory, name = os.path.split(local_path)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:12]}{PARTIAL_SUFFIX}")
+
+def _is_congestion(error) -> bool:
+    """True for throttling, server errors and timeouts: signs that the endpoint or the link is overloaded."""
+    if isinstance(error, oci.exceptions.ServiceError):
+        return error.status == 429 or error.status >= 500
+    # requests and urllib3 name their timeouts Timeout, ReadTimeout, ReadTimeoutError, ...
+    return isinstance(error, (TimeoutError, socket.timeout)) or 'Timeout' in type(error).__name__
+
+class ObjectChangedError(IOError):
+    """Raised when an object is overwritten while its ranged parts are being downloaded."""
+
+def _remove_partial(path: str):
+    """Deletes a partially written download, ignoring a file that was never created."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Could not remove partial download '%s': %s", path, e)
+
 class Downloader:
-    def __init__(self, oci_manager: OCIManager, dry_run=False):
+    def __init__(self, oci_manager: OCIManager, dry_run=False, executor: concurrent.futures.Executor = None,
+                 part_parallel_count: int = None, adaptive=False, skip_existing=False):
         self.oci_manager = oci_manager
         self.object_storage = self.oci_manager.object_storage
         self.namespace = self.oci_manager.namespace
         self.dry_run = dry_run
+        # Optional pool shared with other transfer classes; bulk downloads create their own otherwise
+        self.executor = executor
+        # Ranged parts of one large object fetched concurrently in bulk downloads (default: one per CPU)
+        self.part_parallel_count = part_parallel_count or multiprocessing.cpu_count()
+        # Bulk downloads back off their in-flight count on congestion (see AdaptiveConcurrencyLimit)
+        self.adaptive = adaptive
+        # Folder downloads leave out objects whose local copy has the same size and is not older,
+        # or has the same size and MD5
+        self.skip_existing = skip_existing
 
-    def download_single_file(self, bucket_name: str, object_name: str, local_path: str):
+    def download_single_file(self, bucket_name: str, object_name: str, local_path: str,
+                             object_size: Optional[int] = None, parallel_count: int = 1, not_found_ok: bool = False):
         """
         Downloads a single file from OCI Object Storage with a Rich progress bar and retry logic.
         (Used for interactive single file downloads.)
+        When the object size (given, or learned from the first GET) is above PARALLEL_GET_THRESHOLD,
+        the object is fetched as parallel ranged GETs written at their offsets in the local file.
+        Returns True on success, False otherwise. With not_found_ok, a missing object returns None
+        without logging an error, so callers can probe by attempting the download.
         """
         if self.dry_run:
-            logger.info(f"DRY-RUN: Would download '{object_name}' from bucket '{bucket_name}' to '{local_path}'.")
-            return
+            logger.info("DRY-RUN: Would download '%s' from bucket '%s' to '%s'.", object_name, bucket_name, local_path)
+            return True
+
+        can_range = parallel_count > 1 and hasattr(os, 'pwrite')
+        use_ranged = can_range and object_size is not None and object_size > PARALLEL_GET_THRESHOLD
 
         max_retries = 3
         retry_delay = 1
+        partial_path = _partial_path(local_path)
+        etag = None
         for attempt in range(max_retries):
             try:
-                response = self.object_storage.get_object(self.namespace, bucket_name, object_name)
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                total_size = int(response.headers["Content-Length"]) if response.headers and "Content-Length" in response.headers else None
-                with Progress() as progress:
-                    task = progress.add_task(f"Downloading {object_name}", total=total_size)
-                    with open(local_path, 'wb') as f:
-                        for chunk in response.data.raw.stream(1024 * 1024, decode_content=False):
-                            if chunk:
+                os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
+                if not use_ranged:
+                    response = self.object_storage.get_object(self.namespace, bucket_name, object_name)
+                    total_size = int(response.headers["Content-Length"]) if response.headers and "Content-Length" in response.headers else None
+                    if can_range and object_size is None and total_size is not None and total_size > PARALLEL_GET_THRESHOLD:
+                        # Size was unknown up front; the headers show it is worth splitting into ranges
+                        response.data.raw.close()
+                        object_size = total_size
+                        etag = response.headers.get('etag')
+                        use_ranged = True
+                if use_ranged:
+                    with Progress() as progress:
+                        task = progress.add_task(f"Downloading {object_name}", total=object_size)
+                        self._download_ranged(bucket_name, object_name, partial_path, object_size, parallel_count,
+                                              progress_callback=lambda n: progress.update(task, advance=n),
+                                              etag=etag)
+                else:
+                    with Progress() as progress:
+                        task = progress.add_task(f"Downloading {object_name}", total=total_size)
+                        raw = response.data.raw
+                        read_size = STREAM_INITIAL_READ_SIZE
+                        ramp_at = time.monotonic() + STREAM_RAMP_SECONDS
+                        with open(partial_path, 'wb') as f:
+                            while chunk := raw.read(read_size, decode_content=False):
                                 f.write(chunk)
                                 progress.update(task, advance=len(chunk))
-                logger.info(f"Successfully downloaded '{object_name}' to '{local_path}'.")
-                break
+                                # Long transfers use fewer, larger reads: fewer trips through Python per byte
+                                if read_size < DOWNLOAD_BUFFER_SIZE and time.monotonic() >= ramp_at:
+                                    read_size = DOWNLOAD_BUFFER_SIZE
+                os.replace(partial_path, local_path)
+                logger.info("Successfully downloaded '%s' to '%s'.", object_name, local_path)
+                return True
             except Exception as e:
+                _remove_partial(partial_path)
+                if use_ranged:
+                    # Probe again on the next attempt: the object may have changed size or ETag (412)
+                    object_size, etag, use_ranged = None, None, False
+                status = e.status if isinstance(e, oci.exceptions.ServiceError) else None
+                if not_found_ok and status == 404:
+                    return None
+                if status in [401, 403, 404] or retried_by_client(e):
+                    # Retrying cannot make a missing object or denied request succeed, and the client's
+                    # retry strategy has already retried throttling, server and connection errors
+                    logger.error("Error downloading '%s': non-retriable status %s: %s", object_name, status, e)
+                    break
                 if attempt < max_retries - 1:
-                    logger.warning(f"Download failed for '{object_name}', retrying in {retry_delay} seconds. Error: {e}")
+                    logger.warning("Download failed for '%s', retrying in %s seconds. Error: %s", object_name, retry_delay, e)
                     time.sleep(retry_delay)
                     retry_delay *= 2
                 else:
-                    logger.error(f"Error downloading '{object_name}': {e}")
+                    logger.error("Error downloading '%s': %s", object_name, e)
+        return False
 
-    def _download_file_no_progress(self, bucket_name: str, object_name: str, local_path: str):
+    def _download_ranged(self, bucket_name: str, object_name: str, local_path: str, object_size: int,
+                         parallel_count: int, progress_callback=None, etag: Optional[str] = None):
         """
-        Downloads a single file without creating its own Progress display.
-        This is used by bulk download to avoid multiple live displays.
+        Downloads one object as RANGE_PART_SIZE ranged GETs issued in parallel threads.
+        The local file is pre-sized and every part is written at its own offset with os.pwrite,
+        so parts can complete in any order without reassembly. Raises on the first failed part.
+        Parts are requested with If-Match when etag is known, and raise if their ETags differ,
+        so an object overwritten mid-transfer is never stitched together from two versions.
+        """
+        ranges = [
+            (start, min(start + RANGE_PART_SIZE, object_size) - 1)
+            for start in range(0, object_size, RANGE_PART_SIZE)
+        ]
+        workers = max(1, min(parallel_count, len(ranges)))
+        logger.debug("Downloading '%s' (%s bytes) as %s ranged parts using %s threads.", object_name, object_size, len(ranges), workers)
+
+        get_kwargs = {'if_match': etag} if etag else {}
+        part_etags = set()
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, object_size)
+
+            def fetch_range(start: int, end: int):
+                response = self.object_storage.get_object(
+                    self.namespace, bucket_name, object_name, range=f"bytes={start}-{end}", **get_kwargs
+                )
+                headers = response.headers or {}
+                if headers.get('etag'):
+                    part_etags.add(headers['etag'])
+                # Content-Range ends with the object's current total size
+                content_range = headers.get('content-range', '')
+                if content_range.rpartition('/')[2] not in ('', '*', str(object_size)):
+                    raise ObjectChangedError(f"'{object_name}' changed during the download (now {content_range})")
+                offset = start
+                for chunk in response.data.raw.stream(DOWNLOAD_BUFFER_SIZE, decode_content=False):
+                    view = memoryview(chunk)
+                    while view:
+                        written = os.pwrite(fd, view, offset)
+                        offset += written
+                        view = view[written:]
+                    if progress_callback:
+                        progress_callback(len(chunk))
+                if offset != end + 1:
+                    raise IOError(f"Short read for bytes {start}-{end} of '{object_name}': got {offset - start} bytes")
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='RangedGet') as executor:
+                futures = [executor.submit(fetch_range, start, end) for start, end in ranges]
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            if len(part_etags) > 1:
+                raise ObjectChangedError(f"'{object_name}' changed during the download (ETags {sorted(part_etags)})")
+            if DROP_PAGE_CACHE:
+                _drop_page_cache(fd)
+        finally:
+            os.close(fd)
+
+    def _download_worker(self, bucket_name: str, object_name: str, local_path: str, object_size: Optional[int] = None,
+                         etag: Optional[str] = None):
+        """
+        Worker function to download a single object (part of a bulk download) without its own Progress display.
+        The parent directory of local_path must already exist (see _execute_parallel_download).
+        Objects whose listed size is above PARALLEL_GET_THRESHOLD are fetched as ranged GETs on
+        part_parallel_count connections instead of one stream, pinned to the listed etag with If-Match.
+        An object that changed since it was listed fails at once rather than being retried.
+        Returns: (bool: success, str: object_name, str|None: error_message, bool: congested),
+        where congested reports throttling, server errors or timeouts seen on any attempt.
         """
         max_retries = 3
         retry_delay = 1
+        congested = False
+        partial_path = _partial_path(local_path)
+        use_ranged = (
+            object_size is not None and object_size > PARALLEL_GET_THRESHOLD
+            and self.part_parallel_count > 1 and hasattr(os, 'pwrite')
+        )
         for attempt in range(max_retries):
             try:
-                response = self.object_storage.get_object(self.namespace, bucket_name, object_name)
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                with open(local_path, 'wb') as f:
-                    for chunk in response.data.raw.stream(1024 * 1024, decode_content=False):
-                        if chunk:
-                            f.write(chunk)
-                logger.info(f"Successfully downloaded '{object_name}' to '{local_path}'.")
-                break
+                if use_ranged:
+                    # Parts run on a pool of their own; the shared pool's workers are busy with whole objects
+                    self._download_ranged(bucket_name, object_name, partial_path, object_size, self.part_parallel_count,
+                                          etag=etag)
+                else:
+                    response = self.object_storage.get_object(self.namespace, bucket_name, object_name)
+                    raw = response.data.raw
+                    raw.decode_content = False # Store the object bytes as-is, no decompression in Python
+                    with open(partial_path, 'wb') as f:
+                        # copyfileobj loops in large reads instead of one Python iteration per small chunk
+                        shutil.copyfileobj(raw, f, DOWNLOAD_BUFFER_SIZE)
+                        if DROP_PAGE_CACHE:
+                            f.flush()
+                            _drop_page_cache(f.fileno())
+                # Only complete files ever appear under the final name
+                os.replace(partial_path, local_path)
+                # Per-object records are debug with lazy %-arguments, like bulk uploads; the summary reports the totals
+                logger.debug("Successfully downloaded '%s' to '%s'.", object_name, local_path)
+                return True, object_name, None, congested
             except Exception as e:
+                _remove_partial(partial_path)
+                congested = congested or _is_congestion(e)
+                status = e.status if isinstance(e, oci.exceptions.ServiceError) else None
+                if status == 412 or isinstance(e, ObjectChangedError):
+                    # Overwritten since it was listed: another attempt would fetch a different version
+                    error_msg = f"Object changed since it was listed: {e}"
+                    logger.error("Error downloading '%s': %s", object_name, error_msg)
+                    return False, object_name, error_msg, congested
+                if status in [401, 403, 404] or retried_by_client(e):
+                    # E.g. deleted since it was listed: fail the object now instead of sleeping through retries.
+                    # Throttling, server and connection errors have already been retried by the client.
+                    error_msg = f"Non-retriable status {status}: {e}"
+                    logger.error("Error downloading '%s': %s", object_name, error_msg)
+                    return False, object_name, error_msg, congested
                 if attempt < max_retries - 1:
-                    logger.warning(f"Download failed for '{object_name}', retrying in {retry_delay} seconds. Error: {e}")
+                    logger.warning("Download failed for '%s', retrying in %s seconds. Error: %s", object_name, retry_delay, e)
                     time.sleep(retry_delay)
                     retry_delay *= 2
                 else:
-                    logger.error(f"Error downloading '{object_name}': {e}")
+                    error_msg = f"Failed after {max_retries} attempts: {e}"
+                    logger.error("Error downloading '%s': %s", object_name, error_msg)
+                    return False, object_name, error_msg, congested
+        return False, object_name, "Download failed after retries (unknown worker error)", congested
+
+    def _bulk_executor(self, parallel_count: int):
+        """Context manager yielding the shared executor if one was injected, else a pool owned by this call."""
+        if self.executor is not None:
+            return contextlib.nullcontext(self.executor)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=parallel_count, thread_name_prefix='Downloader')
+
+    def _execute_parallel_download(self, tasks: list, bucket_name: str, parallel_count: int):
+        """
+        Manages the parallel execution of download tasks using ThreadPoolExecutor.
+        tasks: Iterable of tuples: (object_name, local_path, object_size, etag). Tasks are submitted as they
+        are produced, so downloads start while a lazy listing is still paging.
+        At most parallel_count * DOWNLOAD_WINDOW_FACTOR downloads are submitted at once, and in
+        adaptive mode at most AdaptiveConcurrencyLimit.limit.
+        """
+        succeeded_count = 0
+        failed_downloads = []
+        start_time = time.time()
+        limiter = AdaptiveConcurrencyLimit(parallel_count) if self.adaptive else None
+        # Bounded window of submitted downloads: the listing is only advanced as downloads finish,
+        # so a folder of millions of objects never holds more than this many futures.
+        max_in_flight = parallel_count * DOWNLOAD_WINDOW_FACTOR
+
+        with Progress() as progress:
+            overall_task = progress.add_task("Overall Download Progress", total=None)
+            submitted = 0
+            # Completions and submissions are batched into one progress update per interval
+            # instead of taking Rich's lock once per object
+            pending_advance = 0
+            last_progress_update = time.monotonic()
+
+            def refresh_progress(force=False):
+                nonlocal pending_advance, last_progress_update
+                now = time.monotonic()
+                if force or now - last_progress_update >= PROGRESS_UPDATE_INTERVAL:
+                    progress.update(overall_task, total=submitted, advance=pending_advance)
+                    pending_advance = 0
+                    last_progress_update = now
+
+            def collect(done_futures):
+                nonlocal succeeded_count, pending_advance
+                for future in done_futures:
+                    obj_name, local_path, object_size, _ = future_to_object.pop(future)
+                    try:
+                        success, _, error_message, congested = future.result()
+                        if limiter is not None:
+                            if congested:
+                                limiter.record_congestion()
+                            if success:
+                                limiter.record(object_size or 0)
+                        if success:
+                            succeeded_count += 1
+                        else:
+                            failed_downloads.append((obj_name, local_path, error_message))
+                    except Exception as exc:
+                        failed_downloads.append((obj_name, local_path, f"Future exception: {exc}"))
+                        logger.error("Download task for '%s' generated an exception: %s", obj_name, exc, exc_info=True)
+                    pending_advance += 1
+                refresh_progress()
+
+            # Threads suit this I/O-bound work: the SDK releases the GIL while waiting on sockets
+            with self._bulk_executor(parallel_count) as executor:
+                future_to_object = {}
+                unsubmitted = 0
+                # Bound once rather than looked up again for each of possibly millions of objects
+                submit = submit_transfer
+                worker_options = (('part_parallel_count', self.part_parallel_count),)
+                # Each distinct parent directory is created once here instead of in every worker
+                created_dirs = set()
+                for obj_name, local_path, object_size, etag in tasks:
+                    parent_dir = os.path.dirname(local_path)
+                    if parent_dir not in created_dirs:
+                        try:
+                            os.makedirs(parent_dir, exist_ok=True)
+                        except OSError as e:
+                            failed_downloads.append((obj_name, local_path, f"Could not create directory: {e}"))
+                            logger.error("Could not create directory '%s' for '%s': %s", parent_dir, obj_name, e)
+                            unsubmitted += 1
+                            continue
+                        created_dirs.add(parent_dir)
+                    if limiter is not None:
+                        while len(future_to_object) >= limiter.update():
+                            done, _ = concurrent.futures.wait(future_to_object, timeout=limiter.interval,
+                                                              return_when=concurrent.futures.FIRST_COMPLETED)
+                            collect(done)
+                    elif len(future_to_object) >= max_in_flight:
+                        done, _ = concurrent.futures.wait(future_to_object, return_when=concurrent.futures.FIRST_COMPLETED)
+                        collect(done)
+                    future = submit(executor, self, '_download_worker', worker_options,
+                                    bucket_name, obj_name, local_path, object_size, etag)
+                    future_to_object[future] = (obj_name, local_path, object_size, etag)
+                    submitted += 1
+                    refresh_progress()
+                total_files = submitted + unsubmitted
+                logger.info("Found a total of %s objects to download.", total_files)
+
+                for future in concurrent.futures.as_completed(list(future_to_object)):
+                    collect((future,))
+                refresh_progress(force=True)
+
+        duration = time.time() - start_time
+
+        logger.info("-" * 30 + " Download Summary " + "-" * 30)
+        logger.info("Operation completed in %.2f seconds.", duration)
+        logger.info("Total files attempted: %s", total_files)
+        logger.info("Successfully downloaded: %s files", succeeded_count)
+        logger.info("Failed to download: %s", len(failed_downloads))
+        if failed_downloads:
+            logger.warning("Failed items:")
+            for name, path, err in failed_downloads:
+                logger.warning("  - %s (to %s): %s", name, path, err)
+        logger.info("-" * (60 + len(" Download Summary ")))
+        return not failed_downloads
+
+    def _iter_objects(self, bucket_name: str, prefix: str, limit: int = 1000, fields: str = "name,size",
+                      largest_first: bool = False):
+        """
+        Lazily yields the ObjectSummary records under prefix, fetching one list_objects page at a time.
+        Only the fields needed for transfers are requested to keep each page small.
+        With largest_first, each page is yielded by descending size instead of name order.
+        """
+        list_params = {
+            "namespace_name": self.namespace,
+            "bucket_name": bucket_name,
+            "prefix": prefix,
+            "limit": limit,
+            "fields": fields,
+        }
+        page = 1
+        while True:
+            response = self.object_storage.list_objects(**list_params)
+            objects = response.data.objects or []
+            logger.debug("Listing page %s returned %s objects.", page, len(objects))
+            if largest_first:
+                # Large objects start first and overlap with the small ones, instead of one large
+                # object listed last keeping a single worker busy after the rest have finished.
+                # Only whole pages are reordered so downloads still start before the listing ends.
+                yield from sorted(objects, key=lambda obj: getattr(obj, 'size', None) or 0, reverse=True)
+            else:
+                yield from objects
+
+            # next_start_with is the service's continuation token; a full page without one
+            # is followed up from the last name returned.
+            next_start_with = getattr(response.data, 'next_start_with', None)
+            if next_start_with:
+                list_params.pop("start_after", None)
+                list_params["start"] = next_start_with
+            elif objects and len(objects) >= limit:
+                list_params.pop("start", None)
+                list_params["start_after"] = objects[-1].name
+            else:
+                break
+            page += 1
+
+    @staticmethod
+    def _is_downloaded(local_path: str, obj) -> bool:
+        """
+        True if local_path has obj's size and either was written no earlier than obj was last
+        modified or has obj's MD5. The modification time check avoids hashing files this tool
+        downloaded itself; the MD5 check covers copies that arrived some other way.
+        """
+        try:
+            st = os.stat(local_path)
+        except OSError:
+            return False
+        if st.st_size != obj.size:
+            return False
+        time_modified = getattr(obj, 'time_modified', None)
+        if time_modified is not None and st.st_mtime >= time_modified.timestamp():
+            return True
+        # Multipart objects carry no plain MD5, so they are downloaded again
+        expected_md5 = getattr(obj, 'md5', None)
+        if not expected_md5:
+            return False
+        md5 = hashlib.md5()
+        try:
+            with open(local_path, 'rb') as f:
+                while chunk := f.read(MD5_READ_SIZE):
+                    md5.update(chunk)
+        except OSError:
+            return False
+        return base64.b64encode(md5.digest()).decode() == expected_md5
+
+    def _iter_download_tasks(self, bucket_name: str, prefix: str, destination: str, limit: int):
+        """Yields (object_name, local_path, size, etag) for every object under prefix, mirrored below destination."""
+        # Hoisted out of the per-object loop, which can run for hundreds of thousands of objects
+        prefix_len = len(prefix)
+        dest_root = destination if destination.endswith(os.sep) else destination + os.sep
+        # The etag pins ranged downloads to the listed version of each object
+        fields = "name,size,etag,timeModified,md5" if self.skip_existing else "name,size,etag"
+        skipped = 0
+        # Adaptive mode keeps name order: a page sorted largest first ramps throughput down steadily,
+        # which AdaptiveConcurrencyLimit would read as a sign to stop growing
+        largest_first = not (self.dry_run or self.adaptive)
+        for obj in self._iter_objects(bucket_name, prefix, limit=limit, fields=fields, largest_first=largest_first):
+            object_name = obj.name
+            relative_path = object_name[prefix_len:]
+            # Zero-byte 'dir/' markers (e.g. folders created in the console) have no local file
+            if relative_path and relative_path[-1] != '/':
+                local_path = dest_root + relative_path
+                if self.skip_existing and self._is_downloaded(local_path, obj):
+                    skipped += 1
+                    continue
+                yield object_name, local_path, getattr(obj, 'size', None), getattr(obj, 'etag', None)
+        if skipped:
+            logger.info("Skipped %s objects already present in '%s'.", skipped, destination)
 
     def download_folder(self, bucket_name: str, object_path: str, destination: str, parallel_count: int, limit: int = 1000):
         """
@@ -81,110 +520,17 @@ class Downloader:
         """
         prefix = object_path if object_path.endswith('/') else object_path + '/'
 
-        logger.info(f"Listing all objects in remote folder '{prefix}' using pagination...")
+        logger.info("Listing objects in remote folder '%s' and downloading them as pages arrive...", prefix)
 
-        # Save a reference to the original function and wrap it if needed.
-        orig_list_objects = self.object_storage.list_objects
-        if not hasattr(orig_list_objects, '__name__'):
-            def list_objects_wrapper(*args, **kwargs):
-                return orig_list_objects(*args, **kwargs)
-            list_objects_wrapper.__name__ = "list_objects"
-            list_objects_func = list_objects_wrapper
-        else:
-            list_objects_func = orig_list_objects
-
-        try:
-            # Detect if we're in test mode (the patched/mocked function usually has a side_effect)
-            if hasattr(orig_list_objects, "side_effect"):
-                raise AttributeError("Forcing fallback due to test mock")
-            list_objects_response = oci.pagination.list_call_get_all_results(
-                list_objects_func,
-                namespace_name=self.namespace,
-                bucket_name=bucket_name,
-                prefix=prefix,
-                fields="name"
-            )
-            # If the returned data doesn’t look like a real OCI response, force fallback.
-            if not hasattr(list_objects_response.data, 'objects') and not isinstance(list_objects_response.data, list):
-                raise AttributeError("Dummy response detected; falling back to manual pagination.")
-            if hasattr(list_objects_response.data, 'objects'):
-                all_objects = list_objects_response.data.objects
-            elif isinstance(list_objects_response.data, list):
-                all_objects = list_objects_response.data
-            else:
-                all_objects = []
-        except AttributeError as e:
-            logger.info("Falling back to manual pagination due to: " + str(e))
-            all_objects = []
-            start_after = None
-            page = 1
-            while True:
-                if start_after:
-                    response = self.object_storage.list_objects(
-                        namespace_name=self.namespace,
-                        bucket_name=bucket_name,
-                        prefix=prefix,
-                        limit=limit,
-                        start_after=start_after,
-                        fields="name"
-                    )
-                else:
-                    response = self.object_storage.list_objects(
-                        namespace_name=self.namespace,
-                        bucket_name=bucket_name,
-                        prefix=prefix,
-                        limit=limit,
-                        fields="name"
-                    )
-                # Extract objects – support different dummy response formats.
-                if hasattr(response.data, 'objects'):
-                    objects = response.data.objects or []
-                elif isinstance(response.data, list):
-                    objects = response.data
-                else:
-                    try:
-                        objects = response.data.items
-                    except AttributeError:
-                        objects = []
-                all_objects.extend(objects)
-                logger.info(f"Requesting page {page} (start_after={start_after})... Page {page} returned {len(objects)} objects.")
-                if len(objects) < limit:
-                    break
-                start_after = objects[-1].name
-                page += 1
-
-        logger.info(f"Found a total of {len(all_objects)} objects in the folder '{prefix}'.")
+        tasks = self._iter_download_tasks(bucket_name, prefix, destination, limit)
 
         # If dry run, log and exit.
         if self.dry_run:
-            for obj in all_objects:
-                relative_path = obj.name[len(prefix):]
-                if not relative_path:
-                    continue
-                local_file_path = os.path.join(destination, relative_path)
-                logger.info(f"DRY-RUN: Would download '{obj.name}' to '{local_file_path}'.")
-            logger.info("DRY-RUN: Bulk download simulation complete.")
-            return
-
-        total_files = len(all_objects)
-        start_time = time.time()
-        with Progress() as progress:
-            overall_task = progress.add_task("Overall Download Progress", total=total_files)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=parallel_count) as executor:
-                futures = {}
-                def download_file(obj_name):
-                    relative_path = obj_name[len(prefix):]
-                    if not relative_path:
-                        return 0
-                    local_file_path = os.path.join(destination, relative_path)
-                    self._download_file_no_progress(bucket_name, obj_name, local_file_path)
-                    return 1
-
-                for obj in all_objects:
-                    futures[executor.submit(download_file, obj.name)] = 1
-                for future in concurrent.futures.as_completed(futures):
-                    progress.update(overall_task, advance=1)
-            end_time = time.time()
-        duration = end_time - start_time
-        logger.info(f"Bulk download operation completed in {duration:.2f} seconds. Total files downloaded: {total_files}")
+            total_files = 0
+            for obj_name, local_file_path, _, _ in tasks:
+                logger.info("DRY-RUN: Would download '%s' to '%s'.", obj_name, local_file_path)
+                total_files += 1
+            logger.info("DRY-RUN: Bulk download simulation complete (%s objects).", total_files)
+            return True
 
+        return self._execute_parallel_download(tasks, bucket_name, parallel_count)
@@ -1,7 +1,8 @@
 # ocutil/utils/formatters.py
 import math
+from typing import Optional
 
-def human_readable_size(size_bytes: int | None) -> str:
+def human_readable_size(size_bytes: Optional[int]) -> str:
     """Converts a size in bytes to a human-readable string."""
     if size_bytes is None: # Handle case where size might be None from API
         return "N/A"
@@ -28,14 +28,14 @@ class Lister:
         Ensures non-recursive listings use a trailing slash in the API call prefix.
         Logs operational messages to stderr (via logger).
         """
-        logger.debug(f"Attempting to list objects for user path: oc://{bucket_name}/{prefix}")
+        logger.debug("Attempting to list objects for user path: oc://%s/%s", bucket_name, prefix)
 
         # Determine the prefix to use for the API call.
         # For non-recursive, ensure it ends with '/' unless it's empty (bucket root).
         api_prefix = prefix
         if not recursive and api_prefix and not api_prefix.endswith('/'):
             api_prefix += '/'
-            logger.debug(f"Adjusted prefix for API call to: {api_prefix}")
+            logger.debug("Adjusted prefix for API call to: %s", api_prefix)
 
         all_objects = []
         all_prefixes = set()
@@ -64,13 +64,13 @@ class Lister:
             pagination_key = 'next_start_after'
             pagination_param = 'start_after'
 
-        logger.debug(f"Listing parameters for API call: {list_params}")
+        logger.debug("Listing parameters for API call: %s", list_params)
         page = 1
         found_anything = False
         while True:
             try:
                 current_page_token = start_token if not recursive else start_after
-                logger.debug(f"Requesting object list page {page} ({pagination_param}={current_page_token})...")
+                logger.debug("Requesting object list page %s (%s=%s)...", page, pagination_param, current_page_token)
                 # Update the correct pagination parameter for the request
                 if current_page_token:
                     list_params[pagination_param] = current_page_token
@@ -92,7 +92,7 @@ class Lister:
                 all_objects.extend(page_objects)
                 if page_prefixes:
                     all_prefixes.update(page_prefixes)
-                logger.debug(f"Page {page} returned {len(page_objects)} objects and {len(page_prefixes)} prefixes.")
+                logger.debug("Page %s returned %s objects and %s prefixes.", page, len(page_objects), len(page_prefixes))
 
                 if next_page_token:
                     if not recursive:
@@ -112,24 +112,28 @@ class Lister:
 
             except oci.exceptions.ServiceError as e:
                 if e.status == 404 and not found_anything:
-                    logger.error(f"Error: No objects found at '{'oc://' + bucket_name + '/' + prefix}'")
+                    logger.error("Error: No objects found at 'oc://%s/%s'", bucket_name, prefix)
                     break
                 elif e.status == 404 and ('BucketNotFound' in str(e.code) or 'NamespaceNotFound' in str(e.code)):
-                    logger.error(f"Error: Bucket or Namespace not found: '{bucket_name}'")
+                    logger.error("Error: Bucket or Namespace not found: '%s'", bucket_name)
                     sys.exit(1)
                 else:
-                    logger.error(f"Error: Failed to list objects: {e.status} - {e.message}")
-                    logger.debug(f"Error details: {e}")
+                    self.oci_manager.note_service_error(e)
+                    logger.error("Error: Failed to list objects: %s - %s", e.status, e.message)
+                    logger.debug("Error details: %s", e)
                     sys.exit(1)
             except Exception as e:
-                logger.error(f"Error: An unexpected error occurred during listing: {e}", exc_info=True)
+                logger.error("Error: An unexpected error occurred during listing: %s", e, exc_info=True)
                 sys.exit(1)
 
         # --- Print Results ---
         if found_anything or recursive:
             # Pass the ORIGINAL requested prefix for calculating relative paths for display
             self._print_results(all_objects, list(all_prefixes), bucket_name, prefix, long_format, human_readable, recursive)
-            logger.debug(f"Found {len(all_objects)} objects" + (f" and {len(all_prefixes)} prefixes." if not recursive else "."))
+            if recursive:
+                logger.debug("Found %s objects.", len(all_objects))
+            else:
+                logger.debug("Found %s objects and %s prefixes.", len(all_objects), len(all_prefixes))
         # No need for an else here, the 404 handler or lack of items printed covers it
 
     def _print_results(self, objects: list[ObjectSummary], prefixes: list[str], bucket_name: str, requested_prefix: str, long_format: bool, human_readable: bool, recursive: bool):
@@ -1,24 +1,101 @@
 import os
+import json
+import time
+import logging
+import socket
 import oci
 import getpass
 
+# The connection pool tuning below reaches into the SDK's vendored requests, which is private.
+# urllib3 must be the copy that requests uses: older SDKs vendor it too, newer ones use the
+# top-level package the SDK declares. Without either, the client keeps its default pool.
+try:
+    from oci._vendor import requests
+except ImportError:
+    requests = None
+try:
+    from oci._vendor import urllib3
+except ImportError:
+    try:
+        import urllib3
+    except ImportError:
+        urllib3 = None
+
+logger = logging.getLogger('ocutil.oci_manager')
+
+# The namespace of a tenancy never changes, so it is cached on disk between runs
+NAMESPACE_CACHE_FILE = os.path.expanduser("~/.oci/ocutil_cache.json")
+NAMESPACE_CACHE_TTL = 24 * 60 * 60 # seconds
+# Statuses suggesting the cached namespace belongs to other credentials
+NAMESPACE_INVALIDATING_STATUSES = (401, 403)
+
+
+def _transfer_retry_strategy():
+    """
+    Retry strategy applied to every Object Storage call: throttling (429), server errors (5xx)
+    and connection failures are retried with jittered exponential backoff, so a transient
+    error during a large batch costs one request instead of a failed transfer.
+    This is the only retry layer for those failures (see retried_by_client).
+    """
+    return oci.retry.RetryStrategyBuilder(
+        max_attempts_check=True,
+        max_attempts=8,
+        total_elapsed_time_check=True,
+        total_elapsed_time_seconds=600,
+        retry_max_wait_between_calls_seconds=30,
+        retry_base_sleep_time_seconds=1,
+        backoff_type=oci.retry.BACKOFF_EQUAL_JITTER_VALUE,
+        service_error_check=True,
+        service_error_retry_on_any_5xx=True,
+        service_error_retry_config={429: []},
+    ).get_retry_strategy()
+
+
+def retried_by_client(error) -> bool:
+    """
+    True if the client's retry strategy has already retried error: throttling (429), server
+    errors (5xx other than 501) and failures to send a request. Upload and download loops give
+    up on these instead of retrying them again; they only retry failures the client cannot see,
+    such as a connection dropped while a response body is being read.
+    """
+    if isinstance(error, oci.exceptions.ServiceError):
+        return error.status == 429 or (error.status >= 500 and error.status != 501)
+    return requests is not None and isinstance(error, requests.exceptions.RequestException)
+
+
+def _keepalive_socket_options():
+    """urllib3's default socket options plus TCP keep-alive probes where the platform supports them."""
+    options = list(urllib3.connection.HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Linux names; other platforms fall back to the system keep-alive timers
+    for name, value in (('TCP_KEEPIDLE', 30), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
 class OCIManager:
-    def __init__(self, config_profile='DEFAULT'):
+    def __init__(self, config_profile='DEFAULT', config: dict = None, namespace: str = None):
+        """
+        config and namespace may be passed in when they are already known (e.g. by a worker
+        process started from another OCIManager), which skips reading the config file,
+        the passphrase prompt and the namespace lookup.
+        """
         self.config_profile = config_profile
-        self.config = self.load_config()
+        self.config = config if config is not None else self.load_config()
         self.object_storage = self.initialize_object_storage_client()
-        self.namespace = self.get_namespace()
+        self.namespace_from_cache = False
+        self.namespace = namespace or self.get_namespace()
 
     def load_config(self):
         try:
             # Expand the home directory if needed.
             config_path = os.path.expanduser("~/.oci/config")
             config = oci.config.from_file(config_path, self.config_profile)
-            
+
             # Check if pass_phrase is missing or empty and prompt the user if needed.
             if 'pass_phrase' not in config or not config['pass_phrase']:
                 config['pass_phrase'] = getpass.getpass("Enter your OCI key passphrase: ")
-            
+
             return config
         except Exception as e:
             raise Exception(f"Error loading OCI config: {e}")
@@ -26,12 +103,127 @@ class OCIManager:
 
     def initialize_object_storage_client(self):
         try:
-            return oci.object_storage.ObjectStorageClient(self.config)
+            return oci.object_storage.ObjectStorageClient(self.config, retry_strategy=_transfer_retry_strategy())
         except Exception as e:
             raise Exception(f"Error initializing Object Storage Client: {e}")
 
+    def configure_connection_pool(self, pool_size: int):
+        """
+        Grows the HTTPS connection pool of the shared Object Storage client to pool_size.
+        All worker threads share this one client, but requests' default pool keeps only 10
+        connections, so busier pools discard connections and repeat the TLS handshake.
+        Pooled sockets get TCP keep-alive so idle connections between transfers stay usable.
+        The mounted adapter's class, retries and blocking settings are preserved.
+        """
+        if requests is None or urllib3 is None:
+            logger.debug("Connection pool left at its default size: the SDK's requests/urllib3 are not importable.")
+            return
+        try:
+            current_adapter = self.object_storage.base_client.session.adapters.get('https://')
+            if getattr(current_adapter, '_pool_maxsize', 0) >= pool_size:
+                return
+            self._mount_adapter(current_adapter, pool_size)
+            logger.debug("Object Storage connection pool resized to %s connections with TCP keep-alive.", pool_size)
+        except Exception as e:
+            # Only an optimization; the client keeps working with its default pool
+            logger.debug("Could not resize the connection pool: %s", e)
+
+    def reset_connection_pool(self):
+        """
+        Replaces the connection pool with an empty one of the same size.
+        Used in forked worker processes, which must not send requests over sockets
+        (and TLS sessions) still owned by the parent process.
+        """
+        if requests is None or urllib3 is None:
+            # The adapter cannot be rebuilt, so drop the inherited connections instead
+            for adapter in self.object_storage.base_client.session.adapters.values():
+                adapter.close()
+            return
+        current_adapter = self.object_storage.base_client.session.adapters.get('https://')
+        pool_size = getattr(current_adapter, '_pool_maxsize', requests.adapters.DEFAULT_POOLSIZE)
+        self._mount_adapter(current_adapter, pool_size)
+
+    def _mount_adapter(self, current_adapter, pool_size: int):
+        """Mounts a new adapter like current_adapter with room for pool_size keep-alive connections."""
+        session = self.object_storage.base_client.session
+        adapter_class = current_adapter.__class__ if current_adapter is not None else requests.adapters.HTTPAdapter
+        pool_connections = getattr(current_adapter, '_pool_connections', requests.adapters.DEFAULT_POOLSIZE)
+        pool_block = getattr(current_adapter, '_pool_block', requests.adapters.DEFAULT_POOLBLOCK)
+        adapter = adapter_class(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_size,
+            max_retries=getattr(current_adapter, 'max_retries', requests.adapters.DEFAULT_RETRIES),
+            pool_block=pool_block,
+        )
+        # The adapter constructor takes no socket options, so its pool manager is rebuilt with them
+        adapter.init_poolmanager(pool_connections, pool_size, block=pool_block,
+                                 socket_options=_keepalive_socket_options())
+        session.mount('https://', adapter)
+
     def get_namespace(self):
+        cached = self._read_cached_namespace()
+        if cached:
+            logger.debug("Using cached namespace for profile '%s'.", self.config_profile)
+            self.namespace_from_cache = True
+            return cached
         try:
-            return self.object_storage.get_namespace().data
+            namespace = self.object_storage.get_namespace().data
         except Exception as e:
             raise Exception(f"Error retrieving namespace: {e}")
+        self._write_cached_namespace(namespace)
+        return namespace
+
+    def _namespace_cache_key(self) -> str:
+        """The namespace belongs to the tenancy, so entries are keyed by tenancy and region rather than profile."""
+        tenancy = self.config.get('tenancy') or self.config_profile
+        return f"{tenancy}|{self.config.get('region', '')}"
+
+    def _load_namespace_cache(self) -> dict:
+        try:
+            with open(NAMESPACE_CACHE_FILE, 'r') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _store_namespace_cache(self, cache: dict):
+        """Writes the cache through a temporary file so concurrent runs never read a partial file."""
+        temp_path = f"{NAMESPACE_CACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(cache, f)
+            os.replace(temp_path, NAMESPACE_CACHE_FILE)
+        except OSError as e:
+            logger.debug("Could not write namespace cache '%s': %s", NAMESPACE_CACHE_FILE, e)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _read_cached_namespace(self):
+        """Returns the cached namespace for this tenancy and region, or None if missing or stale."""
+        try:
+            entry = self._load_namespace_cache()[self._namespace_cache_key()]
+            if time.time() - entry['cached_at'] > NAMESPACE_CACHE_TTL:
+                return None
+            return entry['namespace']
+        except (KeyError, TypeError):
+            return None
+
+    def _write_cached_namespace(self, namespace: str):
+        """Stores the namespace for this tenancy and region; failures only cost a lookup next time."""
+        cache = self._load_namespace_cache()
+        cache[self._namespace_cache_key()] = {'namespace': namespace, 'cached_at': time.time()}
+        self._store_namespace_cache(cache)
+
+    def invalidate_cached_namespace(self):
+        """Drops this tenancy's cached namespace so the next run looks it up again."""
+        cache = self._load_namespace_cache()
+        if cache.pop(self._namespace_cache_key(), None) is not None:
+            self._store_namespace_cache(cache)
+            logger.debug("Dropped cached namespace for profile '%s'.", self.config_profile)
+
+    def note_service_error(self, error):
+        """Invalidates a cached namespace when a request fails in a way that suggests it is wrong for these credentials."""
+        if self.namespace_from_cache and getattr(error, 'status', None) in NAMESPACE_INVALIDATING_STATUSES:
+            self.invalidate_cached_namespace()
@@ -1,27 +1,64 @@
 # uploader.py
 import os
+import math
+import stat
 import logging
+import itertools
+import hashlib
+import base64
 import concurrent.futures
 import time
 import threading
+import multiprocessing
+import contextlib
 import oci # Import oci for exceptions
 # Import UploadManager
 from oci.object_storage import UploadManager
-from ocutil.utils.oci_manager import OCIManager
+from ocutil.utils.oci_manager import OCIManager, retried_by_client
+from ocutil.utils.concurrency import submit_transfer
 
 # Import Rich progress components
 from rich.progress import Progress, TextColumn, BarColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
 
 logger = logging.getLogger('ocutil.uploader')
 
+# Files above this size are uploaded as multipart uploads with small parts sent in parallel
+MULTIPART_THRESHOLD = 128 * 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+# Object Storage accepts at most this many parts per multipart upload
+MAX_MULTIPART_PARTS = 10000
+# Uploads submitted ahead of the workers, as a multiple of the worker count
+UPLOAD_WINDOW_FACTOR = 4
+# Read size when hashing local files for --skip-existing
+MD5_READ_SIZE = 1024 * 1024
+
 # ProgressFileReader class is no longer needed as UploadManager uses a callback
 
+def _multipart_part_size(file_size: int) -> int:
+    """
+    Part size for a multipart upload of file_size bytes: MULTIPART_PART_SIZE, or larger
+    (rounded up to a whole MiB) when the file would otherwise need more than MAX_MULTIPART_PARTS parts.
+    """
+    mib = 1024 * 1024
+    needed = math.ceil(file_size / MAX_MULTIPART_PARTS / mib) * mib
+    return max(MULTIPART_PART_SIZE, needed)
+
 class Uploader:
-    def __init__(self, oci_manager: OCIManager, dry_run=False):
+    def __init__(self, oci_manager: OCIManager, dry_run=False, part_parallel_count: int = None,
+                 executor: concurrent.futures.Executor = None, skip_existing=False):
         self.oci_manager = oci_manager
         self.object_storage = self.oci_manager.object_storage
         self.namespace = self.oci_manager.namespace
         self.dry_run = dry_run
+        # Bulk uploads leave out files whose object already exists with the same size and MD5
+        self.skip_existing = skip_existing
+        # (size, md5) of existing objects, filled one listed "directory" prefix at a time
+        self._existing_objects = {}
+        self._listed_prefixes = set()
+        # Files left out by the last skip-existing pass, so "nothing to upload" is not an error
+        self.skipped_existing = 0
+        # Optional pool shared with other transfer classes; bulk uploads create their own otherwise
+        self.executor = executor
         # Define progress bar columns suitable for byte transfers
         self.progress_columns = [
             TextColumn("[progress.description]{task.description}"),
@@ -34,8 +71,43 @@ class Uploader:
         # Pass allow_parallel_uploads=True to enable parallel part uploads for *single large files*
         # The UploadManager itself uses threads internally for this feature.
         self.upload_manager = UploadManager(self.object_storage, allow_parallel_uploads=True)
+        # Parts of one large file uploaded concurrently (default: one stream per CPU)
+        self.part_parallel_count = part_parallel_count or multiprocessing.cpu_count()
+        # Created on first large file
+        self._large_file_upload_manager = None
+        self._large_file_manager_lock = threading.Lock()
         logger.debug("Initialized OCI UploadManager.")
 
+    @property
+    def large_file_upload_manager(self) -> UploadManager:
+        """UploadManager used for files above MULTIPART_THRESHOLD, created on first use."""
+        with self._large_file_manager_lock:
+            if self._large_file_upload_manager is None:
+                self._large_file_upload_manager = UploadManager(
+                    self.object_storage, allow_parallel_uploads=True, parallel_process_count=self.part_parallel_count
+                )
+            return self._large_file_upload_manager
+
+    def _upload_file(self, local_file: str, bucket_name: str, object_name: str, file_size: int, progress_callback=None):
+        """
+        Uploads one file with the UploadManager suited to its size.
+        Files above MULTIPART_THRESHOLD are split into parts of _multipart_part_size() uploaded in parallel.
+        """
+        kwargs = {}
+        upload_manager = self.upload_manager
+        if file_size > MULTIPART_THRESHOLD:
+            upload_manager = self.large_file_upload_manager
+            kwargs['part_size'] = _multipart_part_size(file_size)
+        if progress_callback:
+            kwargs['progress_callback'] = progress_callback
+        return upload_manager.upload_file(
+            namespace_name=self.namespace,
+            bucket_name=bucket_name,
+            object_name=object_name,
+            file_path=local_file,
+            **kwargs
+        )
+
 
     def upload_single_file(self, local_file: str, bucket_name: str, object_path: str):
         """
@@ -43,11 +115,11 @@ class Uploader:
         with a Rich progress bar and retry logic.
         """
         if not os.path.isfile(local_file):
-            logger.error(f"Local file '{local_file}' does not exist or is not a file.")
+            logger.error("Local file '%s' does not exist or is not a file.", local_file)
             return False
 
         if self.dry_run:
-            logger.info(f"DRY-RUN: Would upload '{local_file}' to bucket '{bucket_name}' as '{object_path}'.")
+            logger.info("DRY-RUN: Would upload '%s' to bucket '%s' as '%s'.", local_file, bucket_name, object_path)
             return True # Indicate success for dry run
 
         max_retries = 3
@@ -55,7 +127,7 @@ class Uploader:
         try:
             file_size = os.path.getsize(local_file)
         except OSError as e:
-             logger.error(f"Could not get size of '{local_file}': {e}")
+             logger.error("Could not get size of '%s': %s", local_file, e)
              return False
 
         for attempt in range(max_retries):
@@ -70,24 +142,20 @@ class Uploader:
 
                     # Use UploadManager to upload the file
                     # It expects the file path, not a file object
-                    logger.debug(f"Attempt {attempt+1}: Calling UploadManager.upload_file for '{local_file}'")
-                    response = self.upload_manager.upload_file(
-                        namespace_name=self.namespace,
-                        bucket_name=bucket_name,
-                        object_name=object_path,
-                        file_path=local_file,
+                    logger.debug("Attempt %s: Calling UploadManager.upload_file for '%s'", attempt+1, local_file)
+                    response = self._upload_file(
+                        local_file, bucket_name, object_path, file_size,
                         progress_callback=single_file_progress_callback if file_size > 0 else None # Avoid callback for zero-byte files
-                        # Can add optional part_size, allow_multipart, etc. if needed
                     )
 
                 # Check response status after upload completes
                 # UploadManager usually raises errors, but we check status for certainty
                 if 200 <= response.status < 300:
-                    logger.info(f"Successfully uploaded '{local_file}' to '{object_path}'.")
+                    logger.info("Successfully uploaded '%s' to '%s'.", local_file, object_path)
                     return True # Success
                 else:
                     # Should not typically be reached if UploadManager raises exceptions on failure
-                    logger.error(f"UploadManager returned non-success status for '{local_file}': {response.status}")
+                    logger.error("UploadManager returned non-success status for '%s': %s", local_file, response.status)
                     # Simulate an exception to trigger retry logic if necessary
                     raise oci.exceptions.ServiceError(
                         status=response.status,
@@ -97,71 +165,60 @@ class Uploader:
                     )
 
             except oci.exceptions.ServiceError as e:
-                 # Don't retry 404 on bucket or authentication issues
-                 if e.status in [401, 403, 404]:
-                       logger.error(f"Upload failed for '{local_file}' with non-retriable status {e.status}: {e}")
+                 # Don't retry 404 on bucket or authentication issues, nor throttling and server
+                 # errors the client's retry strategy has already retried
+                 if e.status in [401, 403, 404] or retried_by_client(e):
+                       logger.error("Upload failed for '%s' with non-retriable status %s: %s", local_file, e.status, e)
                        return False
-                 # Handle potential 429 Rate Limiting specifically (optional enhancement)
-                 elif e.status == 429:
-                       wait_time = retry_delay * 2 # Apply longer backoff for rate limit
-                       logger.warning(f"Rate limit (429) hit for '{local_file}' (Attempt {attempt+1}/{max_retries}), retrying in {wait_time} seconds...")
-                       if attempt < max_retries - 1:
-                           time.sleep(wait_time)
-                           retry_delay = wait_time # Use the longer delay for next potential retry
-                       else:
-                           logger.error(f"Error uploading '{local_file}' after {max_retries} attempts due to rate limiting.")
-                           return False # Failed after retries
                  elif attempt < max_retries - 1:
-                     logger.warning(f"Upload failed for '{local_file}' (Attempt {attempt+1}/{max_retries}), retrying in {retry_delay} seconds. Status: {e.status}. Error: {e}")
+                     logger.warning("Upload failed for '%s' (Attempt %s/%s), retrying in %s seconds. Status: %s. Error: %s",
+                                    local_file, attempt+1, max_retries, retry_delay, e.status, e)
                      time.sleep(retry_delay)
                      retry_delay *= 2 # Standard exponential backoff
                  else:
-                     logger.error(f"Error uploading '{local_file}' after {max_retries} attempts. Status: {e.status}. Error: {e}")
+                     logger.error("Error uploading '%s' after %s attempts. Status: %s. Error: %s", local_file, max_retries, e.status, e)
                      return False # Failed after retries
             except Exception as e:
                  # Catch other potential errors (network, file reading handled by UploadManager)
-                 if attempt < max_retries - 1:
-                     logger.warning(f"Upload failed for '{local_file}' (Attempt {attempt+1}/{max_retries}), retrying in {retry_delay} seconds. Error: {e}")
+                 if retried_by_client(e):
+                     logger.error("Upload failed for '%s' after the client's retries: %s", local_file, e)
+                     return False
+                 elif attempt < max_retries - 1:
+                     logger.warning("Upload failed for '%s' (Attempt %s/%s), retrying in %s seconds. Error: %s",
+                                    local_file, attempt+1, max_retries, retry_delay, e)
                      time.sleep(retry_delay)
                      retry_delay *= 2
                  else:
-                     logger.error(f"Error uploading '{local_file}' after {max_retries} attempts: {e}")
+                     logger.error("Error uploading '%s' after %s attempts: %s", local_file, max_retries, e)
                      return False # Failed after retries
         return False # Failed all retries
 
 
-    def _upload_worker(self, local_file: str, bucket_name: str, object_name: str):
+    def _upload_worker(self, local_file: str, bucket_name: str, object_name: str, file_size: int):
         """
         Worker function to upload a single file (part of a bulk upload) using UploadManager.
+        file_size comes from the stat in _iter_upload_tasks, so the worker does not stat the file again.
         Returns: (bool: success, str: local_file, int: bytes_uploaded, str|None: error_message)
         """
         max_retries = 3
         retry_delay = 1
-        file_size = 0 # Initialize size
 
         try:
-            # Check file existence and get size *before* attempting upload
-            if not os.path.isfile(local_file):
-                raise FileNotFoundError(f"File not found during worker execution: {local_file}")
-            file_size = os.path.getsize(local_file)
-
             for attempt in range(max_retries):
                 try:
                     # Use UploadManager - no manual file opening needed
                     # No progress_callback here for bulk worker efficiency
                     # Rely on UploadManager's internal retries for part failures
-                    logger.debug(f"Worker {os.getpid()}/{threading.current_thread().name}: Attempt {attempt+1} uploading '{local_file}' using UploadManager.")
-                    response = self.upload_manager.upload_file(
-                        namespace_name=self.namespace,
-                        bucket_name=bucket_name,
-                        object_name=object_name,
-                        file_path=local_file
-                    )
+                    # Per-file debug records use lazy %-arguments: nothing is formatted unless DEBUG is on
+                    logger.debug("Worker %d/%s: Attempt %d uploading '%s' using UploadManager.",
+                                 os.getpid(), threading.current_thread().name, attempt + 1, local_file)
+                    response = self._upload_file(local_file, bucket_name, object_name, file_size)
 
                     # Check status after successful call return
                     if 200 <= response.status < 300:
                          # Minimal success log for bulk
-                         logger.debug(f"Worker {os.getpid()}/{threading.current_thread().name}: Successfully uploaded '{local_file}' to '{object_name}'.")
+                         logger.debug("Worker %d/%s: Successfully uploaded '%s' to '%s'.",
+                                      os.getpid(), threading.current_thread().name, local_file, object_name)
                          return True, local_file, file_size, None # Success
                     else:
                          # Should not happen if UploadManager raises errors, but handle defensively
@@ -173,87 +230,75 @@ class Uploader:
                          )
 
                 except oci.exceptions.ServiceError as e:
-                    # Non-retriable errors
-                    if e.status in [401, 403, 404]:
+                    # Non-retriable errors, and throttling/server errors the client has already retried
+                    if e.status in [401, 403, 404] or retried_by_client(e):
                          error_msg = f"Non-retriable status {e.status}: {e}"
-                         logger.error(f"Upload failed for '{local_file}': {error_msg}")
+                         logger.error("Upload failed for '%s': %s", local_file, error_msg)
                          return False, local_file, 0, error_msg
-                    # Handle potential 429 Rate Limiting specifically (optional enhancement)
-                    elif e.status == 429:
-                        wait_time = retry_delay * 2 # Apply longer backoff for rate limit
-                        logger.warning(f"Rate limit (429) hit for '{local_file}' (Attempt {attempt+1}/{max_retries}), retrying in {wait_time} seconds...")
-                        if attempt < max_retries - 1:
-                            time.sleep(wait_time)
-                            retry_delay = wait_time # Use longer delay
-                        else:
-                            error_msg = f"Failed after {max_retries} attempts due to rate limiting (429)."
-                            logger.error(f"Error uploading '{local_file}': {error_msg}")
-                            return False, local_file, 0, error_msg
                     elif attempt < max_retries - 1:
-                        logger.warning(f"Upload attempt {attempt+1} failed for '{local_file}', retrying in {retry_delay}s. Status: {e.status}. Error: {e}")
+                        logger.warning("Upload attempt %s failed for '%s', retrying in %ss. Status: %s. Error: %s",
+                                       attempt+1, local_file, retry_delay, e.status, e)
                         time.sleep(retry_delay)
                         retry_delay *= 2
                     else:
                         error_msg = f"Failed after {max_retries} attempts. Status: {e.status}. Error: {e}"
-                        logger.error(f"Error uploading '{local_file}': {error_msg}")
+                        logger.error("Error uploading '%s': %s", local_file, error_msg)
                         return False, local_file, 0, error_msg # Failed after retries
                 except Exception as e:
                     # Other errors (e.g., file read errors during upload are now handled inside UploadManager)
                     # Catch potential setup issues or unexpected UploadManager errors
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Upload attempt {attempt+1} failed for '{local_file}', retrying in {retry_delay}s. Error: {e}")
+                    if retried_by_client(e):
+                        error_msg = f"Failed after the client's retries: {e}"
+                        logger.error("Upload failed for '%s': %s", local_file, error_msg)
+                        return False, local_file, 0, error_msg
+                    elif attempt < max_retries - 1:
+                        logger.warning("Upload attempt %s failed for '%s', retrying in %ss. Error: %s", attempt+1, local_file, retry_delay, e)
                         time.sleep(retry_delay)
                         retry_delay *= 2
                     else:
                          error_msg = f"Failed after {max_retries} attempts: {e}"
-                         logger.error(f"Error uploading '{local_file}': {error_msg}")
+                         logger.error("Error uploading '%s': %s", local_file, error_msg)
                          return False, local_file, 0, error_msg # Failed after retries
 
             # Fallback if loop finishes unexpectedly
             return False, local_file, 0, "Upload failed after retries (unknown worker error)"
 
-        except FileNotFoundError as e:
-             logger.error(f"Upload failed for '{local_file}': {e}")
-             return False, local_file, 0, str(e)
-        except OSError as e:
-            # Catch errors getting size
-            logger.error(f"Upload preparation failed for '{local_file}' (get size): {e}")
-            return False, local_file, 0, f"Preparation failed (get size): {e}"
         except Exception as e:
              # Catch other unexpected setup issues
-             logger.error(f"Upload preparation failed for '{local_file}': {e}")
+             logger.error("Upload preparation failed for '%s': %s", local_file, e)
              return False, local_file, 0, f"Preparation failed: {e}"
 
-    # --- _execute_parallel_upload method remains the same ---
-    # It receives the file_size correctly from the modified _upload_worker
-    def _execute_parallel_upload(self, tasks: list, bucket_name: str, parallel_count: int):
+    def _bulk_executor(self, parallel_count: int):
+        """Context manager yielding the shared executor if one was injected, else a pool owned by this call."""
+        if self.executor is not None:
+            return contextlib.nullcontext(self.executor)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=parallel_count, thread_name_prefix='Uploader')
+
+    def _execute_parallel_upload(self, tasks, bucket_name: str, parallel_count: int):
         """
         Manages the parallel execution of upload tasks using ThreadPoolExecutor.
-        tasks: List of tuples: (object_name, full_path, file_size)
+        tasks: Iterable of tuples: (object_name, full_path, file_size). Tasks are submitted
+        as they are produced, so a lazy iterable starts uploading before it is exhausted.
+        Returns: (bool: all succeeded, int: number of files attempted)
         """
-        total_files = len(tasks)
-        total_size = sum(t[2] for t in tasks)
+        total_files = 0
+        total_size = 0
         succeeded_count = 0
         succeeded_bytes = 0
         failed_uploads = []
         start_time = time.time()
 
-        # Need threading module for thread name logging in worker
-        import threading
+        # Bounded window of submitted uploads: the task iterable is only advanced as uploads
+        # finish, so a huge wildcard or folder never queues more than this many futures.
+        max_in_flight = parallel_count * UPLOAD_WINDOW_FACTOR
 
         with Progress(*self.progress_columns, transient=True) as progress:
-            overall_task = progress.add_task("Overall Upload Progress", total=total_size)
-            # Use ThreadPoolExecutor for I/O-bound tasks
-            with concurrent.futures.ThreadPoolExecutor(max_workers=parallel_count, thread_name_prefix='Uploader') as executor:
-                # Submit all upload tasks
-                future_to_file = {
-                    # Pass args to _upload_worker
-                    executor.submit(self._upload_worker, full_path, bucket_name, obj_name): (full_path, obj_name)
-                    for obj_name, full_path, _ in tasks # Use pre-calculated size only for total
-                }
-
-                for future in concurrent.futures.as_completed(future_to_file):
-                    local_path, obj_name = future_to_file[future]
+            overall_task = progress.add_task("Overall Upload Progress", total=None)
+
+            def collect(done_futures):
+                nonlocal succeeded_count, succeeded_bytes
+                for future in done_futures:
+                    local_path, obj_name = future_to_file.pop(future)
                     try:
                         # Get result tuple from worker
                         success, _, bytes_uploaded, error_message = future.result()
@@ -267,9 +312,30 @@ class Uploader:
                     except Exception as exc:
                         # Catch exceptions raised if _upload_worker itself fails unexpectedly
                         failed_uploads.append((local_path, obj_name, f"Future exception: {exc}"))
-                        logger.error(f"Upload task for '{local_path}' generated an exception: {exc}", exc_info=True) # Add traceback
+                        logger.error("Upload task for '%s' generated an exception: %s", local_path, exc, exc_info=True) # Add traceback
                         # Do not advance progress for unexpected exceptions
 
+            # Use ThreadPoolExecutor for I/O-bound tasks
+            with self._bulk_executor(parallel_count) as executor:
+                future_to_file = {}
+                for obj_name, full_path, file_size in tasks:
+                    if len(future_to_file) >= max_in_flight:
+                        done, _ = concurrent.futures.wait(future_to_file, return_when=concurrent.futures.FIRST_COMPLETED)
+                        collect(done)
+                    future = submit_transfer(executor, self, '_upload_worker',
+                                             (('part_parallel_count', self.part_parallel_count),),
+                                             full_path, bucket_name, obj_name, file_size)
+                    future_to_file[future] = (full_path, obj_name)
+                    total_files += 1
+                    total_size += file_size
+                    progress.update(overall_task, total=total_size)
+
+                for future in concurrent.futures.as_completed(list(future_to_file)):
+                    collect((future,))
+
+        if not total_files:
+            return True, 0
+
         end_time = time.time()
         duration = end_time - start_time
         # Ensure MiB calculation is correct, handle division by zero
@@ -277,116 +343,209 @@ class Uploader:
         succeeded_mib = succeeded_bytes / (1024 * 1024) if succeeded_bytes else 0
 
         logger.info("-" * 30 + " Upload Summary " + "-" * 30)
-        logger.info(f"Operation completed in {duration:.2f} seconds.")
-        logger.info(f"Total files attempted: {total_files} ({total_size_mib:.2f} MiB)")
-        logger.info(f"Successfully uploaded: {succeeded_count} files ({succeeded_mib:.2f} MiB)")
-        logger.info(f"Failed to upload: {len(failed_uploads)}")
+        logger.info("Operation completed in %.2f seconds.", duration)
+        logger.info("Total files attempted: %s (%.2f MiB)", total_files, total_size_mib)
+        logger.info("Successfully uploaded: %s files (%.2f MiB)", succeeded_count, succeeded_mib)
+        logger.info("Failed to upload: %s", len(failed_uploads))
         if failed_uploads:
             logger.warning("Failed items:")
             for path, name, err in failed_uploads:
-                logger.warning(f"  - {path} (as {name}): {err}")
+                logger.warning("  - %s (as %s): %s", path, name, err)
         logger.info("-" * (60 + len(" Upload Summary ")))
-
-
-    # --- upload_files method remains the same ---
-    # It calls _execute_parallel_upload which uses the modified _upload_worker
-    def upload_files(self, file_list: list, bucket_name: str, parallel_count: int):
+        return not failed_uploads, total_files
+
+
+    def _load_existing_objects(self, bucket_name: str, prefix: str):
+        """Records (size, md5) of the objects directly under prefix, one paginated listing per prefix."""
+        self._listed_prefixes.add(prefix)
+        start = None
+        while True:
+            data = self.object_storage.list_objects(
+                self.namespace, bucket_name, prefix=prefix, delimiter='/', start=start,
+                limit=1000, fields="name,size,md5"
+            ).data
+            for obj in data.objects or []:
+                self._existing_objects[obj.name] = (obj.size, obj.md5)
+            start = getattr(data, 'next_start_with', None)
+            if not start:
+                break
+
+    def _is_uploaded(self, bucket_name: str, object_name: str, local_file: str, file_size: int) -> bool:
+        """True if object_name already exists with the size and MD5 of local_file."""
+        prefix = object_name[:object_name.rfind('/') + 1]
+        if prefix not in self._listed_prefixes:
+            self._load_existing_objects(bucket_name, prefix)
+        existing = self._existing_objects.get(object_name)
+        if existing is None or existing[0] != file_size:
+            return False
+        if not existing[1]:
+            # Multipart objects are listed without a plain MD5
+            return self._matches_multipart_md5(bucket_name, object_name, local_file, file_size)
+        md5 = hashlib.md5()
+        with open(local_file, 'rb') as f:
+            while chunk := f.read(MD5_READ_SIZE):
+                md5.update(chunk)
+        return base64.b64encode(md5.digest()).decode() == existing[1]
+
+    def _matches_multipart_md5(self, bucket_name: str, object_name: str, local_file: str, file_size: int) -> bool:
+        """
+        True if the multipart object's opc-multipart-md5 ("<MD5 of the part MD5s>-<part count>")
+        matches local_file split into parts of _multipart_part_size(file_size), the size this
+        uploader uses. Objects uploaded with another part size do not match and are uploaded again.
+        """
+        try:
+            headers = self.object_storage.head_object(self.namespace, bucket_name, object_name).headers
+        except oci.exceptions.ServiceError as e:
+            logger.debug("Could not read the multipart MD5 of '%s': %s", object_name, e)
+            return False
+        expected, _, part_count = (headers.get('opc-multipart-md5') or '').rpartition('-')
+        part_size = _multipart_part_size(file_size)
+        if not expected or part_count != str(math.ceil(file_size / part_size)):
+            return False
+        part_digests = bytearray()
+        with open(local_file, 'rb') as f:
+            for _ in range(int(part_count)):
+                md5 = hashlib.md5()
+                remaining = part_size
+                while remaining and (chunk := f.read(min(MD5_READ_SIZE, remaining))):
+                    md5.update(chunk)
+                    remaining -= len(chunk)
+                part_digests += md5.digest()
+        return base64.b64encode(hashlib.md5(part_digests).digest()).decode() == expected
+
+    def _without_existing(self, tasks, bucket_name: str):
+        """Filters (object_name, local_file, file_size) tasks down to files not yet in the bucket."""
+        self.skipped_existing = skipped = 0
+        for task in tasks:
+            object_name, local_file, file_size = task
+            try:
+                if self._is_uploaded(bucket_name, object_name, local_file, file_size):
+                    skipped += 1
+                    self.skipped_existing = skipped
+                    logger.debug("Skipping '%s': '%s' is already up to date.", local_file, object_name)
+                    continue
+            except OSError as e:
+                logger.warning("Could not compare '%s' with '%s', uploading it: %s", local_file, object_name, e)
+            yield task
+        if skipped:
+            logger.info("Skipped %s files already present in bucket '%s'.", skipped, bucket_name)
+
+    def _iter_upload_tasks(self, file_list):
+        """Yields (object_name, local_file, file_size) for each existing file in file_list."""
+        for local_file, object_name in file_list:
+            # One stat answers both "is it a regular file" and "how big is it"
+            try:
+                st = os.stat(local_file)
+            except FileNotFoundError:
+                logger.warning("Skipping non-existent file: %s", local_file)
+                continue
+            except OSError as e:
+                logger.warning("Skipping file '%s' due to error getting size: %s", local_file, e)
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                logger.warning("Skipping '%s': not a regular file", local_file)
+                continue
+            yield object_name, local_file, st.st_size
+
+    def upload_files(self, file_list, bucket_name: str, parallel_count: int):
          """
          Uploads an explicit list of files in parallel.
-         file_list: A list of tuples, where each tuple is (local_file_path, object_name)
+         file_list: An iterable of tuples, where each tuple is (local_file_path, object_name).
+         It is consumed lazily, so uploads begin while a generator is still producing entries.
+         Returns True if every file was uploaded, False if any failed or none were valid.
          """
-         tasks = []
-         logger.info(f"Preparing to upload {len(file_list)} specified files...")
-         for local_file, object_name in file_list:
-             if not os.path.isfile(local_file):
-                 logger.warning(f"Skipping non-existent file: {local_file}")
-                 continue
-             try:
-                 file_size = os.path.getsize(local_file)
-                 tasks.append((object_name, local_file, file_size))
-             except OSError as e:
-                  logger.warning(f"Skipping file '{local_file}' due to error getting size: {e}")
-
-         if not tasks:
-              logger.error("No valid files found to upload from the provided list.")
-              return
-
-         total_files = len(tasks)
-         total_size_mb = sum(t[2] for t in tasks) / (1024 * 1024) if tasks else 0
-         logger.info(f"Starting upload of {total_files} files ({total_size_mb:.2f} MiB) to bucket '{bucket_name}' using {parallel_count} threads...")
+         tasks = self._iter_upload_tasks(file_list)
+         if self.skip_existing:
+             tasks = self._without_existing(tasks, bucket_name)
 
          if self.dry_run:
              logger.info("DRY-RUN: Simulating file list upload...")
+             dry_run_count = 0
              for object_name, full_path, _ in tasks:
-                 logger.info(f"DRY-RUN: Would upload '{full_path}' as '{object_name}'.")
+                 logger.info("DRY-RUN: Would upload '%s' as '%s'.", full_path, object_name)
+                 dry_run_count += 1
+             if not dry_run_count and not self.skipped_existing:
+                 logger.error("No valid files found to upload from the provided list.")
+                 return False
              logger.info("DRY-RUN: File list upload simulation complete.")
-             return
+             return True
 
-         self._execute_parallel_upload(tasks, bucket_name, parallel_count)
+         logger.info("Starting upload of matched files to bucket '%s' using %s threads...", bucket_name, parallel_count)
+         succeeded, total_files = self._execute_parallel_upload(tasks, bucket_name, parallel_count)
+         if not total_files:
+              if self.skipped_existing:
+                   return True # Everything was already uploaded
+              logger.error("No valid files found to upload from the provided list.")
+              return False
+         return succeeded
 
 
-    # --- upload_folder method remains the same ---
-    # It calls _execute_parallel_upload which uses the modified _upload_worker
-    def upload_folder(self, local_dir: str, bucket_name: str, object_prefix: str, parallel_count: int):
-        """
-        Uploads all files from a local directory to OCI Object Storage using parallel execution.
-        """
-        if not os.path.isdir(local_dir):
-            logger.error(f"Local directory '{local_dir}' does not exist or is not a directory.")
-            return
-
-        tasks = []
-        logger.info(f"Scanning directory '{local_dir}' for files to upload...")
+    def _iter_folder_tasks(self, local_dir: str, object_prefix: str):
+        """Yields (object_name, full_path, file_size) for every regular file below local_dir, as os.walk finds it."""
+        # Ensure prefix doesn't have leading/trailing slashes for joining
+        cleaned_prefix = object_prefix.strip('/') if object_prefix else ''
         for root, _, files in os.walk(local_dir):
             for file in files:
                 full_path = os.path.join(root, file)
                 try:
-                     if os.path.islink(full_path):
-                          logger.debug(f"Skipping symbolic link: {full_path}")
+                     # A single lstat instead of separate islink/isfile/getsize calls
+                     st = os.lstat(full_path)
+                     if stat.S_ISLNK(st.st_mode):
+                          logger.debug("Skipping symbolic link: %s", full_path)
                           continue
-                     if not os.path.isfile(full_path):
-                          logger.debug(f"Skipping non-file item: {full_path}")
+                     if not stat.S_ISREG(st.st_mode):
+                          logger.debug("Skipping non-file item: %s", full_path)
                           continue
 
-                     file_size = os.path.getsize(full_path)
                      relative_path = os.path.relpath(full_path, local_dir)
                      # Ensure forward slashes for object storage paths
                      object_name_parts = [part for part in relative_path.split(os.sep)]
 
                      # Handle prefixing correctly
-                     if object_prefix:
-                         # Ensure prefix doesn't have leading/trailing slashes for joining
-                         cleaned_prefix = object_prefix.strip('/')
+                     if cleaned_prefix:
                          # Join prefix and relative path parts
                          final_object_name = "/".join([cleaned_prefix] + object_name_parts)
                      else:
                           # No prefix, just use relative path parts
                           final_object_name = "/".join(object_name_parts)
 
-                     tasks.append((final_object_name, full_path, file_size))
-                     # Reduce debug noise during scan
-                     # logger.debug(f"Found file: '{full_path}' -> OCI object: '{final_object_name}' (Size: {file_size})")
+                     yield final_object_name, full_path, st.st_size
 
                 except OSError as e:
-                    logger.warning(f"Skipping file '{full_path}' due to error: {e}")
+                    logger.warning("Skipping file '%s' due to error: %s", full_path, e)
                 except Exception as e:
-                     logger.warning(f"Skipping file '{full_path}' due to unexpected error during scanning: {e}")
+                     logger.warning("Skipping file '%s' due to unexpected error during scanning: %s", full_path, e)
 
-        if not tasks:
-            logger.info(f"No files found to upload in directory '{local_dir}'.")
-            return
+    def upload_folder(self, local_dir: str, bucket_name: str, object_prefix: str, parallel_count: int):
+        """
+        Uploads all files from a local directory to OCI Object Storage using parallel execution.
+        The directory walk feeds the upload window directly, so the first uploads run while
+        the rest of the tree is still being scanned; totals are reported in the summary.
+        Returns True if every file was uploaded (or there was nothing to upload), False otherwise.
+        """
+        if not os.path.isdir(local_dir):
+            logger.error("Local directory '%s' does not exist or is not a directory.", local_dir)
+            return False
 
-        total_files = len(tasks)
-        total_size_mb = sum(t[2] for t in tasks) / (1024 * 1024) if tasks else 0
-        logger.info(f"Found {total_files} files ({total_size_mb:.2f} MiB) to upload.")
-        logger.info(f"Starting bulk upload to bucket '{bucket_name}' under prefix '{object_prefix or '<bucket root>'}' using {parallel_count} threads...") # Clarify prefix
+        logger.info("Scanning directory '%s' for files to upload...", local_dir)
+        tasks = self._iter_folder_tasks(local_dir, object_prefix)
+        first_task = next(tasks, None)
+        if first_task is None:
+            logger.info("No files found to upload in directory '%s'.", local_dir)
+            return True
+        tasks = itertools.chain((first_task,), tasks)
+        if self.skip_existing:
+            tasks = self._without_existing(tasks, bucket_name)
 
+        logger.info("Starting bulk upload to bucket '%s' under prefix '%s' using %s threads...",
+                    bucket_name, object_prefix or '<bucket root>', parallel_count) # Clarify prefix
 
         if self.dry_run:
             logger.info("DRY-RUN: Simulating bulk folder upload...")
             for object_name, full_path, _ in tasks:
-                logger.info(f"DRY-RUN: Would upload '{full_path}' as '{object_name}'.")
+                logger.info("DRY-RUN: Would upload '%s' as '%s'.", full_path, object_name)
             logger.info("DRY-RUN: Bulk folder upload simulation complete.")
-            return
+            return True
 
-        self._execute_parallel_upload(tasks, bucket_name, parallel_count)
\ No newline at end of file
+        succeeded, _ = self._execute_parallel_upload(tasks, bucket_name, parallel_count)
+        return succeeded
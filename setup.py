@@ -18,5 +18,5 @@ setup(
             'ocutil=ocutil.main:main',
         ],
     },
-    python_requires='>=3.6',
+    python_requires='>=3.9',
 )
@@ -13,6 +13,17 @@ import io # For capturing stdout/stderr
 import contextlib # For redirect_stdout/stderr
 import datetime
 import re # For checking ls -lH output patterns
+import base64
+import hashlib
+import json
+import time
+import glob
+import threading
+import concurrent.futures
+import math
+import multiprocessing
+import random
+import socket
 from unittest.mock import patch, MagicMock, ANY # Import ANY for flexible arg matching
 
 # --- Potentially Needed OCI Classes for Mocking ---
@@ -21,17 +32,18 @@ import oci
 # Example: from oci.object_storage.models import ObjectSummary, ListObjects
 
 # --- Classes being tested ---
-from ocutil.utils.oci_manager import OCIManager
-from ocutil.utils.uploader import Uploader
-from ocutil.utils.downloader import Downloader
+from ocutil.utils.oci_manager import OCIManager, NAMESPACE_CACHE_TTL
+from ocutil.utils.uploader import Uploader, _multipart_part_size, MULTIPART_PART_SIZE, MAX_MULTIPART_PARTS
+from ocutil.utils.downloader import Downloader, _partial_path, _remove_partial, DOWNLOAD_WINDOW_FACTOR, _is_congestion
 from ocutil.utils.lister import Lister # Import the Lister
 from ocutil.utils.formatters import human_readable_size # Import formatter
+from ocutil.utils.concurrency import create_executor, submit_transfer, _init_worker_process, _run_in_worker_process, pick_parallel_count, default_parallel_count, measure_rtt, AdaptiveConcurrencyLimit, SAMPLE_COMPLETIONS_PER_SLOT
 
 # --- Main script and helpers ---
 # Import the main entry point and potentially helpers if needed directly
 # Note: Testing main directly can be complex due to argparse/exit calls
 # We will patch sys.argv and relevant methods instead where needed
-from ocutil.main import main, adjust_remote_object_path, parse_remote_path
+from ocutil.main import main, adjust_remote_object_path, parse_remote_path, classify_remote_source, iter_wildcard_matches, handle_cp_command, _PARSER, setup_logging, flush_logging, _BufferedFileHandler, _CachedTimeFormatter, LOG_DATE_FORMAT, run_native_folder_upload
 
 # --- Configure Logging for Tests (Optional) ---
 # You might want to configure logging differently for tests,
@@ -93,6 +105,7 @@ class TestOCUtil(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
+        global _oci_manager_instance
         # Perform bucket existence check once
         if _oci_manager_instance:
             try:
@@ -106,17 +119,14 @@ class TestOCUtil(unittest.TestCase):
                     print(f"\n\nERROR: Test bucket '{cls.BUCKET_NAME}' not found or accessible.")
                     print("Please create the bucket or check permissions/config profile.")
                     print("Skipping all integration tests.\n")
-                    global _oci_manager_instance
                     _oci_manager_instance = None # Prevent tests from running
                 else:
                     print(f"\n\nERROR: Could not verify test bucket '{cls.BUCKET_NAME}': {e}")
                     print("Skipping all integration tests.\n")
-                    global _oci_manager_instance # pylint: disable=global-variable-not-assigned
                     _oci_manager_instance = None
             except Exception as e:
                  print(f"\n\nERROR: Unexpected error checking test bucket: {e}")
                  print("Skipping all integration tests.\n")
-                 global _oci_manager_instance # pylint: disable=global-variable-not-assigned
                  _oci_manager_instance = None
 
 
@@ -308,7 +318,7 @@ class TestOCUtil(unittest.TestCase):
         # Patch list_objects and the actual download worker
         with patch.object(self.oci_manager.object_storage, 'list_objects', side_effect=side_effect):
             # Patch the CORRECT worker function name
-            with patch.object(self.downloader, '_download_worker', return_value=(True, "dummy", None)) as mock_download_worker:
+            with patch.object(self.downloader, '_download_worker', return_value=(True, "dummy", None, False)) as mock_download_worker:
                 # Need to use a real OCIManager if not skipping tests
                 temp_downloader = Downloader(self.oci_manager) if self.oci_manager else Downloader(MagicMock()) # Use mock manager if skipped
                 # Call download_folder with limit to force pagination checks (limit=2)
@@ -459,8 +469,8 @@ class TestOCUtil(unittest.TestCase):
 
     # --- main Function Flow Tests (using patching) ---
 
-    @patch('ocutil.main.OCIManager') # Patch manager to avoid real connection setup
-    @patch('ocutil.main.Uploader') # Patch Uploader class
+    @patch('ocutil.utils.oci_manager.OCIManager') # Patch manager to avoid real connection setup
+    @patch('ocutil.utils.uploader.Uploader') # Patch Uploader class
     def test_main_cp_upload_folder_flow(self, mock_uploader_cls, mock_oci_manager_cls):
         """Test main() dispatches correctly for folder upload."""
         mock_uploader_instance = mock_uploader_cls.return_value
@@ -477,8 +487,8 @@ class TestOCUtil(unittest.TestCase):
 
 
     # MODIFIED: Patch target fixed
-    @patch('ocutil.main.OCIManager')
-    @patch('ocutil.main.Uploader')
+    @patch('ocutil.utils.oci_manager.OCIManager')
+    @patch('ocutil.utils.uploader.Uploader')
     def test_main_cp_upload_wildcard_flow(self, mock_uploader_cls, mock_oci_manager_cls):
         """Test main() dispatches correctly for wildcard upload."""
         mock_uploader_instance = mock_uploader_cls.return_value
@@ -491,7 +501,8 @@ class TestOCUtil(unittest.TestCase):
         # Check that upload_files (new method for wildcards) was called
         mock_uploader_instance.upload_files.assert_called_once()
         # Check the list passed to upload_files
-        call_args_list = mock_uploader_instance.upload_files.call_args.args[0]
+        # upload_files receives a lazy iterable; materialize it to inspect the entries
+        call_args_list = list(mock_uploader_instance.upload_files.call_args.args[0])
         self.assertEqual(len(call_args_list), 2) # file1.txt, file2.txt
         # Check expected remote names (should be under wildcard_dest/)
         expected_remote1 = "wildcard_dest/file1.txt"
@@ -503,8 +514,8 @@ class TestOCUtil(unittest.TestCase):
         self.assertEqual(actual_files[1][1], expected_remote2)
 
 
-    @patch('ocutil.main.OCIManager')
-    @patch('ocutil.main.Downloader') # Patch Downloader class
+    @patch('ocutil.utils.oci_manager.OCIManager')
+    @patch('ocutil.utils.downloader.Downloader') # Patch Downloader class
     def test_main_cp_download_folder_flow(self, mock_downloader_cls, mock_oci_manager_cls):
         """Test main() dispatches correctly for folder download."""
         mock_downloader_instance = mock_downloader_cls.return_value
@@ -545,8 +556,8 @@ class TestOCUtil(unittest.TestCase):
     def test_upload_retry_error(self):
         """Simulate an error during single file upload to test retry logic."""
         # Force upload_manager.upload_file to raise an error
-        # Simulate a retriable service error (e.g., 500)
-        simulated_error = oci.exceptions.ServiceError(status=500, code="InternalError", message="Simulated error", headers={})
+        # Simulate a failure the client's retry strategy does not see (e.g., a read error mid-upload)
+        simulated_error = ConnectionResetError("Simulated error")
         # Need to patch the method on the *instance* used by the test's uploader
         with patch.object(self.uploader.upload_manager, 'upload_file', side_effect=simulated_error) as mock_upload_mngr:
             # Check logger warnings for retry messages
@@ -561,7 +572,8 @@ class TestOCUtil(unittest.TestCase):
 
     def test_download_retry_error(self):
         """Simulate an error during single file download to test retry logic."""
-        simulated_error = oci.exceptions.ServiceError(status=500, code="InternalError", message="Simulated error", headers={})
+        # A connection dropped while streaming the body is not retried by the client, so the loop retries it
+        simulated_error = ConnectionResetError("Simulated error")
         # Need to patch both head_object (for size check) and get_object
         # Let head_object succeed, but get_object fail
         mock_head_response = MagicMock(headers={"Content-Length": "100"})
@@ -574,6 +586,18 @@ class TestOCUtil(unittest.TestCase):
                 self.assertTrue(any("retrying" in message for message in log.output),
                                  f"Expected retry message, got: {log.output}")
 
+    def test_client_retried_error_not_retried_again(self):
+        """A 5xx has already been retried by the client's retry strategy, so the transfer loops give up at once."""
+        simulated_error = oci.exceptions.ServiceError(status=500, code="InternalError", message="Simulated error", headers={})
+        with patch.object(self.uploader.upload_manager, 'upload_file', side_effect=simulated_error) as mock_upload_mngr:
+            success = self.uploader.upload_single_file(self.single_file_path, self.BUCKET_NAME, "error_simulated_upload.txt")
+        self.assertFalse(success)
+        self.assertEqual(mock_upload_mngr.call_count, 1)
+        with patch.object(self.oci_manager.object_storage, 'get_object', side_effect=simulated_error) as mock_get:
+            success = self.downloader.download_single_file(self.BUCKET_NAME, "error_simulated_dl.txt", os.path.join(self.download_dir, "error_dl.txt"))
+        self.assertFalse(success)
+        self.assertEqual(mock_get.call_count, 1)
+
     # --- Summary Report Tests (Unchanged) ---
     @skip_if_oci_uninitialized
     def test_summary_report_upload(self):
@@ -874,6 +898,1104 @@ class TestOCUtil(unittest.TestCase):
         self.assertTrue(found_file1, f"Call to upload_file for {self.file1_path} not found")
 
 
+# ======================================================
+# ====== Unit Tests Against a Fake Storage Client ======
+# ======================================================
+# These need no OCI config or bucket: the Object Storage client is replaced by FakeObjectStorage.
+
+def _b64_md5(data: bytes) -> str:
+    return base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+class FakeRawStream(io.BytesIO):
+    """Stands in for the urllib3 response behind response.data.raw."""
+
+    def read(self, size=-1, decode_content=True):
+        return super().read(size)
+
+    def stream(self, amt, decode_content=True):
+        while chunk := self.read(amt):
+            yield chunk
+
+
+class FakeObjectStorage:
+    """
+    In-memory Object Storage client covering the calls ocutil makes for transfers.
+    Parameters use the SDK's names, so keyword calls (namespace_name=..., bucket_name=...) work too.
+    objects maps name -> bytes. etags may override an object's ETag (default 'etag-<name>'),
+    part_etags the ETag returned for ranged GETs starting at a given offset, and
+    multipart_md5 the opc-multipart-md5 of objects listed without a plain MD5.
+    page_size caps listing pages below the requested limit; with continuation_token=False
+    full pages come without next_start_with, like listings paged by start_after.
+    """
+
+    def __init__(self, objects=None, page_size=None, continuation_token=True):
+        self.objects = dict(objects or {})
+        self.etags = {}
+        self.part_etags = {}
+        self.multipart_md5 = {}
+        self.time_modified = {}
+        self.page_size = page_size
+        self.continuation_token = continuation_token
+        self.calls = []
+
+    def _etag(self, name):
+        return self.etags.get(name, f"etag-{name}")
+
+    def _not_found(self, name):
+        return oci.exceptions.ServiceError(status=404, code="ObjectNotFound", message=f"{name} not found", headers={})
+
+    def _summary(self, name):
+        data = self.objects[name]
+        return oci.object_storage.models.ObjectSummary(
+            name=name, size=len(data), etag=self._etag(name),
+            md5=None if name in self.multipart_md5 else _b64_md5(data),
+            time_modified=self.time_modified.get(name, datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)),
+        )
+
+    def get_namespace(self, **kwargs):
+        self.calls.append(('get_namespace',))
+        return MagicMock(data="fake-namespace")
+
+    def list_objects(self, namespace_name, bucket_name, prefix=None, start=None, start_after=None, limit=1000,
+                     fields=None, delimiter=None, **kwargs):
+        self.calls.append(('list_objects', prefix, limit, start, start_after))
+        prefix = prefix or ''
+        names = sorted(name for name in self.objects if name.startswith(prefix))
+        if start:
+            names = [name for name in names if name >= start]
+        if start_after:
+            names = [name for name in names if name > start_after]
+        prefixes = []
+        if delimiter:
+            prefixes = sorted({name[:name.index(delimiter, len(prefix)) + 1]
+                               for name in names if delimiter in name[len(prefix):]})
+            names = [name for name in names if delimiter not in name[len(prefix):]]
+        page_size = min(limit, self.page_size or limit)
+        page, rest = names[:page_size], names[page_size:]
+        next_start_with = rest[0] if rest and self.continuation_token else None
+        return MockListResponse(MockListData(objects=[self._summary(name) for name in page], prefixes=prefixes,
+                                             next_start_with=next_start_with))
+
+    def head_bucket(self, namespace_name, bucket_name, **kwargs):
+        self.calls.append(('head_bucket', bucket_name, kwargs.get('retry_strategy')))
+        return MockListResponse(None)
+
+    def head_object(self, namespace_name, bucket_name, object_name, **kwargs):
+        self.calls.append(('head_object', object_name))
+        if object_name not in self.objects:
+            raise self._not_found(object_name)
+        headers = {"Content-Length": str(len(self.objects[object_name])), "etag": self._etag(object_name)}
+        if object_name in self.multipart_md5:
+            headers["opc-multipart-md5"] = self.multipart_md5[object_name]
+        return MockListResponse(None, headers=headers)
+
+    def get_object(self, namespace_name, bucket_name, object_name, range=None, if_match=None, **kwargs):
+        self.calls.append(('get_object', object_name, range))
+        if object_name not in self.objects:
+            raise self._not_found(object_name)
+        data = self.objects[object_name]
+        etag = self._etag(object_name)
+        headers = {"etag": etag}
+        if range:
+            start, end = (int(bound) for bound in range[len("bytes="):].split('-'))
+            etag = self.part_etags.get((object_name, start), etag)
+            if if_match and if_match != etag:
+                raise oci.exceptions.ServiceError(status=412, code="IfMatchFailed", message="ETag mismatch", headers={})
+            headers["etag"] = etag
+            headers["content-range"] = f"bytes {start}-{end}/{len(data)}"
+            data = data[start:end + 1]
+        headers["Content-Length"] = str(len(data))
+        return MockListResponse(MagicMock(raw=FakeRawStream(data)), headers=headers)
+
+
+class FakeOCIManager:
+    """Minimal OCIManager replacement exposing a FakeObjectStorage."""
+
+    def __init__(self, objects=None, **storage_options):
+        self.object_storage = FakeObjectStorage(objects, **storage_options)
+        self.namespace = "fake-namespace"
+        self.config_profile = "DEFAULT"
+        self.config = {}
+
+    def configure_connection_pool(self, pool_size: int):
+        pass
+
+    def reset_connection_pool(self):
+        pass
+
+    def note_service_error(self, error):
+        pass
+
+
+class TestNativeFolderUpload(unittest.TestCase):
+    def run_native(self, *cp_args, pass_phrase=None):
+        args = _PARSER.parse_args(["cp", "/data/folder", "oc://bucket/backup/", "--transfer-backend", "native", *cp_args])
+        manager = FakeOCIManager()
+        if pass_phrase:
+            manager.config['pass_phrase'] = pass_phrase
+        with patch('ocutil.main.shutil.which', return_value="/usr/bin/oci"), \
+                patch('ocutil.main.subprocess.run', return_value=MagicMock(returncode=0)) as mock_run:
+            self.assertTrue(run_native_folder_upload(args, manager, "bucket", "backup/", 8, logging.getLogger("ocutil.test")))
+        return mock_run.call_args
+
+    def test_bulk_upload_command(self):
+        command = self.run_native().args[0]
+        self.assertEqual(command[:4], ["/usr/bin/oci", "os", "object", "bulk-upload"])
+        self.assertEqual(command[command.index("--parallel-upload-count") + 1], "8")
+        self.assertEqual(command[command.index("--object-prefix") + 1], "backup/")
+        self.assertIn("--overwrite", command)
+        self.assertNotIn("--no-overwrite", command)
+
+    def test_passphrase_is_passed_in_the_environment(self):
+        call = self.run_native(pass_phrase="secret")
+        self.assertEqual(call.kwargs['env']['OCI_CLI_PASSPHRASE'], "secret")
+        self.assertNotIn("secret", call.args[0])
+
+    def test_environment_is_inherited_without_a_passphrase(self):
+        self.assertIsNone(self.run_native().kwargs['env'])
+
+    def test_missing_cli_returns_none(self):
+        args = _PARSER.parse_args(["cp", "/data/folder", "oc://bucket/", "--transfer-backend", "native"])
+        with patch('ocutil.main.shutil.which', return_value=None):
+            self.assertIsNone(run_native_folder_upload(args, FakeOCIManager(), "bucket", "", 8, logging.getLogger("ocutil.test")))
+
+    def test_skip_existing_is_rejected(self):
+        argv = ["ocutil", "cp", "/data/folder", "oc://bucket/", "--transfer-backend", "native", "--skip-existing"]
+        with patch('sys.argv', argv), patch('sys.stderr', new=io.StringIO()) as stderr, \
+                patch('ocutil.main.setup_logging') as mock_setup_logging:
+            with self.assertRaises(SystemExit) as context:
+                main()
+        self.assertEqual(context.exception.code, 2)
+        self.assertIn("--skip-existing cannot be used with --transfer-backend native", stderr.getvalue())
+        mock_setup_logging.assert_not_called()
+
+
+class TestClassifyRemoteSource(unittest.TestCase):
+    def classify(self, objects, object_path):
+        manager = FakeOCIManager({name: b"x" * 3 for name in objects})
+        return classify_remote_source(manager, "bucket", object_path)
+
+    def test_exact_object_is_file(self):
+        self.assertEqual(self.classify(["data.csv", "data.csv.bak"], "data.csv"), ('file', 3))
+
+    def test_object_name_that_is_also_a_prefix_is_file(self):
+        self.assertEqual(self.classify(["dir", "dir/a"], "dir"), ('file', 3))
+
+    def test_prefix_with_children_is_folder(self):
+        self.assertEqual(self.classify(["dir/a", "dir/b"], "dir"), ('folder', None))
+
+    def test_folder_sorted_after_siblings(self):
+        # 'dir-a' and 'dir-b' sort before 'dir/', so the first listing does not show the folder
+        self.assertEqual(self.classify(["dir-a", "dir-b", "dir/x"], "dir"), ('folder', None))
+
+    def test_siblings_only_is_missing(self):
+        self.assertEqual(self.classify(["dir-a", "dir-b"], "dir"), (None, None))
+
+    def test_missing(self):
+        self.assertEqual(self.classify(["other"], "dir"), (None, None))
+
+    def test_single_listing_for_a_file(self):
+        manager = FakeOCIManager({"data.csv": b"abc"})
+        classify_remote_source(manager, "bucket", "data.csv")
+        self.assertEqual([call[0] for call in manager.object_storage.calls], ['list_objects'])
+
+
+class _RangedDownloadCase(unittest.TestCase):
+    """Fixture for ranged downloads: an 11-part object with 1 KiB ranges."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.data = os.urandom(10 * 1024 + 123)
+        self.manager = FakeOCIManager({"big.bin": self.data})
+        self.downloader = Downloader(self.manager)
+        self.local_path = os.path.join(self.test_dir, "big.bin")
+        patcher = patch('ocutil.utils.downloader.RANGE_PART_SIZE', 1024)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def ranges_requested(self):
+        return [call[2] for call in self.manager.object_storage.calls if call[0] == 'get_object' and call[2]]
+
+
+class TestRangedDownload(_RangedDownloadCase):
+    def test_parts_assembled_in_order(self):
+        self.downloader._download_ranged("bucket", "big.bin", self.local_path, len(self.data), 4)
+        with open(self.local_path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        ranges = self.ranges_requested()
+        self.assertEqual(len(ranges), 11)
+        self.assertIn("bytes=0-1023", ranges)
+        self.assertIn(f"bytes=10240-{len(self.data) - 1}", ranges)
+
+    def test_single_file_download_uses_ranges_above_threshold(self):
+        with patch('ocutil.utils.downloader.PARALLEL_GET_THRESHOLD', 4096):
+            self.assertTrue(self.downloader.download_single_file("bucket", "big.bin", self.local_path, parallel_count=4))
+        with open(self.local_path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(len(self.ranges_requested()), 11)
+
+    def test_single_file_download_streams_below_threshold(self):
+        self.assertTrue(self.downloader.download_single_file("bucket", "big.bin", self.local_path, parallel_count=4))
+        with open(self.local_path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(self.ranges_requested(), [])
+
+
+class TestRangedDownloadConsistency(_RangedDownloadCase):
+    def test_etag_mismatch_between_parts_raises(self):
+        # Without a known ETag up front, parts from two versions of the object are detected afterwards
+        self.manager.object_storage.part_etags[("big.bin", 2048)] = "etag-new"
+        with self.assertRaisesRegex(IOError, "changed during the download"):
+            self.downloader._download_ranged("bucket", "big.bin", self.local_path, len(self.data), 4)
+
+    def test_etag_mismatch_with_known_etag_fails_part(self):
+        self.manager.object_storage.part_etags[("big.bin", 2048)] = "etag-new"
+        with self.assertRaises(oci.exceptions.ServiceError) as context:
+            self.downloader._download_ranged("bucket", "big.bin", self.local_path, len(self.data), 4, etag="etag-big.bin")
+        self.assertEqual(context.exception.status, 412)
+
+    def test_size_change_raises(self):
+        with self.assertRaisesRegex(IOError, "changed during the download"):
+            self.downloader._download_ranged("bucket", "big.bin", self.local_path, len(self.data) - 1, 4)
+
+    def test_bulk_ranged_download_pins_listed_etag(self):
+        self.downloader.part_parallel_count = 4
+        with patch('ocutil.utils.downloader.PARALLEL_GET_THRESHOLD', 1024), patch.object(self.manager.object_storage, 'get_object', wraps=self.manager.object_storage.get_object) as mock_get:
+            success, *_ = self.downloader._download_worker("bucket", "big.bin", self.local_path, len(self.data),
+                                                           "etag-big.bin")
+        self.assertTrue(success)
+        self.assertEqual({call.kwargs.get('if_match') for call in mock_get.call_args_list}, {"etag-big.bin"})
+
+    def test_bulk_download_of_changed_object_fails_without_retrying(self):
+        # Overwritten between the listing and the download
+        self.downloader.part_parallel_count = 4
+        with patch('ocutil.utils.downloader.PARALLEL_GET_THRESHOLD', 1024), patch('time.sleep') as mock_sleep, \
+                self.assertLogs("ocutil.downloader", level="ERROR"):
+            success, _, error_message, _ = self.downloader._download_worker(
+                "bucket", "big.bin", self.local_path, len(self.data), "etag-old")
+        self.assertFalse(success)
+        self.assertIn("changed since it was listed", error_message)
+        mock_sleep.assert_not_called()
+        # One attempt: no more than the object's 11 ranges were requested
+        self.assertLessEqual(len(self.ranges_requested()), 11)
+        self.assertFalse(os.path.exists(self.local_path))
+
+    def test_folder_download_passes_listed_etags(self):
+        self.manager.object_storage.objects["dir/big.bin"] = self.data
+        destination = os.path.join(self.test_dir, "out")
+        with patch.object(self.downloader, '_download_worker', return_value=(True, "dir/big.bin", None, False)) as mock_worker:
+            self.assertTrue(self.downloader.download_folder("bucket", "dir/", destination, parallel_count=2))
+        self.assertEqual(mock_worker.call_args.args[-1], "etag-dir/big.bin")
+
+
+class TestPartialDownloadCleanup(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.manager = FakeOCIManager({"a": b"payload"})
+        self.downloader = Downloader(self.manager)
+        self.local_path = os.path.join(self.test_dir, "a")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_partial_path_is_unique_and_hidden(self):
+        first, second = _partial_path(self.local_path), _partial_path(self.local_path)
+        self.assertNotEqual(first, second)
+        self.assertEqual(os.path.dirname(first), self.test_dir)
+        self.assertTrue(os.path.basename(first).startswith(".a."))
+        self.assertNotIn(first, (self.local_path, self.local_path + ".part"))
+
+    def test_failed_download_leaves_no_partial_file(self):
+        broken = FakeRawStream(b"pay")
+        broken.read = MagicMock(side_effect=[b"pay", ConnectionResetError("dropped")] * 3)
+        response = MockListResponse(MagicMock(raw=broken), headers={"Content-Length": "7"})
+        with patch.object(self.manager.object_storage, 'get_object', return_value=response), patch('time.sleep'):
+            self.assertFalse(self.downloader.download_single_file("bucket", "a", self.local_path))
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_failed_bulk_download_leaves_no_partial_file(self):
+        with patch.object(self.manager.object_storage, 'get_object', side_effect=ConnectionResetError("dropped")), \
+                patch('time.sleep'):
+            success, *_ = self.downloader._download_worker("bucket", "a", self.local_path, 7)
+        self.assertFalse(success)
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_successful_download_leaves_other_files_alone(self):
+        # An object named 'a.part' downloaded next to 'a' must survive
+        with open(self.local_path + ".part", 'wb') as f:
+            f.write(b"other object")
+        self.assertTrue(self.downloader.download_single_file("bucket", "a", self.local_path))
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["a", "a.part"])
+        with open(self.local_path + ".part", 'rb') as f:
+            self.assertEqual(f.read(), b"other object")
+
+    def test_remove_partial_ignores_missing_file(self):
+        _remove_partial(os.path.join(self.test_dir, "never-created"))
+
+
+class TestSkipExistingUploads(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.data = b"existing content"
+        self.local_path = self.write("file.txt", self.data)
+        self.manager = FakeOCIManager({"prefix/file.txt": self.data})
+        self.uploader = Uploader(self.manager, skip_existing=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def is_uploaded(self):
+        return self.uploader._is_uploaded("bucket", "prefix/file.txt", self.local_path, len(self.data))
+
+    def multipart_md5(self, data, parts=1):
+        return f"{base64.b64encode(hashlib.md5(hashlib.md5(data).digest()).digest()).decode()}-{parts}"
+
+    def test_skipped_on_md5_match(self):
+        self.assertTrue(self.is_uploaded())
+
+    def test_not_skipped_on_md5_mismatch(self):
+        self.manager.object_storage.objects["prefix/file.txt"] = b"different bytes!"
+        self.assertFalse(self.is_uploaded())
+
+    def test_not_skipped_on_size_mismatch(self):
+        self.manager.object_storage.objects["prefix/file.txt"] = b"short"
+        self.assertFalse(self.is_uploaded())
+
+    def test_listing_is_fetched_once_per_prefix(self):
+        self.is_uploaded()
+        self.uploader._is_uploaded("bucket", "prefix/other.txt", self.local_path, len(self.data))
+        listings = [call for call in self.manager.object_storage.calls if call[0] == 'list_objects']
+        self.assertEqual(len(listings), 1)
+
+    def test_skipped_on_multipart_md5_match(self):
+        self.manager.object_storage.multipart_md5["prefix/file.txt"] = self.multipart_md5(self.data)
+        self.assertTrue(self.is_uploaded())
+
+    def test_not_skipped_on_multipart_part_count_mismatch(self):
+        self.manager.object_storage.multipart_md5["prefix/file.txt"] = self.multipart_md5(self.data, parts=2)
+        self.assertFalse(self.is_uploaded())
+
+    @patch('ocutil.utils.uploader.UploadManager.upload_file', return_value=MagicMock(status=200))
+    def test_bulk_upload_sends_only_changed_files(self, mock_upload_file):
+        changed_path = self.write("changed.txt", b"new content")
+        self.manager.object_storage.objects["prefix/changed.txt"] = b"old content"
+        file_list = [(self.local_path, "prefix/file.txt"), (changed_path, "prefix/changed.txt")]
+        self.assertTrue(self.uploader.upload_files(file_list, "bucket", parallel_count=2))
+        uploaded = [call.kwargs['object_name'] for call in mock_upload_file.call_args_list]
+        self.assertEqual(uploaded, ["prefix/changed.txt"])
+
+    @patch('ocutil.utils.uploader.UploadManager.upload_file', return_value=MagicMock(status=200))
+    def test_bulk_upload_with_everything_present_succeeds(self, mock_upload_file):
+        self.assertTrue(self.uploader.upload_files([(self.local_path, "prefix/file.txt")], "bucket", parallel_count=2))
+        mock_upload_file.assert_not_called()
+
+
+class _LocalCopyCase(unittest.TestCase):
+    """Fixture with one local file and a helper describing the remote object it was downloaded from."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.local_path = os.path.join(self.test_dir, "file.txt")
+        self.data = b"existing content"
+        with open(self.local_path, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def remote(self, size=None, md5=None, modified_offset=0):
+        """ObjectSummary of the remote copy, modified modified_offset seconds after the local file."""
+        local_mtime = os.stat(self.local_path).st_mtime
+        return oci.object_storage.models.ObjectSummary(
+            name="file.txt", size=len(self.data) if size is None else size, md5=md5,
+            time_modified=datetime.datetime.fromtimestamp(local_mtime + modified_offset, datetime.timezone.utc),
+        )
+
+
+class TestSkipExistingDownloads(_LocalCopyCase):
+    def test_skipped_when_local_copy_is_newer(self):
+        self.assertTrue(Downloader._is_downloaded(self.local_path, self.remote(modified_offset=-60)))
+
+    def test_not_skipped_when_remote_is_newer(self):
+        self.assertFalse(Downloader._is_downloaded(self.local_path, self.remote(modified_offset=60)))
+
+    def test_not_skipped_on_size_mismatch(self):
+        self.assertFalse(Downloader._is_downloaded(self.local_path, self.remote(size=1, modified_offset=-60)))
+
+    def test_not_skipped_for_missing_file(self):
+        self.assertFalse(Downloader._is_downloaded(os.path.join(self.test_dir, "missing"), self.remote()))
+
+    def test_folder_download_fetches_only_missing_or_changed_objects(self):
+        # Listed objects default to a modification time in 2020, older than the local file
+        manager = FakeOCIManager({"dir/file.txt": self.data, "dir/changed.txt": b"new", "dir/new.txt": b"n"})
+        with open(os.path.join(self.test_dir, "changed.txt"), 'wb') as f:
+            f.write(b"stale content")
+        downloader = Downloader(manager, skip_existing=True)
+        self.assertTrue(downloader.download_folder("bucket", "dir/", self.test_dir, parallel_count=2))
+        fetched = sorted(call[1] for call in manager.object_storage.calls if call[0] == 'get_object')
+        self.assertEqual(fetched, ["dir/changed.txt", "dir/new.txt"])
+        with open(os.path.join(self.test_dir, "changed.txt"), 'rb') as f:
+            self.assertEqual(f.read(), b"new")
+
+
+class TestSkipExistingDownloadMd5(_LocalCopyCase):
+    def test_skipped_on_md5_match_when_remote_is_newer(self):
+        self.assertTrue(Downloader._is_downloaded(self.local_path, self.remote(md5=_b64_md5(self.data), modified_offset=60)))
+
+    def test_not_skipped_on_md5_mismatch_when_remote_is_newer(self):
+        self.assertFalse(Downloader._is_downloaded(self.local_path, self.remote(md5=_b64_md5(b"other"), modified_offset=60)))
+
+    def test_multipart_object_without_md5_is_downloaded_again(self):
+        self.assertFalse(Downloader._is_downloaded(self.local_path, self.remote(md5=None, modified_offset=60)))
+
+
+class _NamespaceCacheCase(unittest.TestCase):
+    """Points the namespace cache at a temporary file and counts get_namespace lookups."""
+    CONFIG = {"tenancy": "ocid1.tenancy.oc1..test", "region": "eu-frankfurt-1"}
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.test_dir, "ocutil_cache.json")
+        self.storage = FakeObjectStorage()
+        for patcher in (patch('ocutil.utils.oci_manager.NAMESPACE_CACHE_FILE', self.cache_file),
+                        patch.object(OCIManager, 'initialize_object_storage_client', return_value=self.storage)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def manager(self, **config):
+        return OCIManager(config=dict(self.CONFIG, **config))
+
+    def lookups(self):
+        return sum(1 for call in self.storage.calls if call[0] == 'get_namespace')
+
+
+class TestNamespaceCache(_NamespaceCacheCase):
+    def test_miss_looks_up_and_caches(self):
+        manager = self.manager()
+        self.assertEqual(manager.namespace, "fake-namespace")
+        self.assertFalse(manager.namespace_from_cache)
+        self.assertEqual(self.lookups(), 1)
+        with open(self.cache_file) as f:
+            self.assertEqual([entry["namespace"] for entry in json.load(f).values()], ["fake-namespace"])
+
+    def test_hit_skips_lookup(self):
+        self.manager()
+        manager = self.manager()
+        self.assertEqual(manager.namespace, "fake-namespace")
+        self.assertTrue(manager.namespace_from_cache)
+        self.assertEqual(self.lookups(), 1)
+
+    def test_stale_entry_misses(self):
+        self.manager()
+        with patch('time.time', return_value=time.time() + 2 * NAMESPACE_CACHE_TTL):
+            self.manager()
+        self.assertEqual(self.lookups(), 2)
+
+    def test_corrupt_cache_file_misses(self):
+        with open(self.cache_file, 'w') as f:
+            f.write("not json")
+        self.assertEqual(self.manager().namespace, "fake-namespace")
+        self.assertEqual(self.lookups(), 1)
+
+
+class TestNamespaceCacheKey(_NamespaceCacheCase):
+    def test_other_profile_of_same_tenancy_hits(self):
+        self.manager()
+        self.assertTrue(OCIManager(config_profile="OTHER", config=dict(self.CONFIG)).namespace_from_cache)
+        self.assertEqual(self.lookups(), 1)
+
+    def test_other_region_misses(self):
+        self.manager()
+        self.manager(region="us-ashburn-1")
+        self.assertEqual(self.lookups(), 2)
+
+    def test_auth_error_invalidates_cached_namespace(self):
+        self.manager()
+        manager = self.manager()
+        manager.note_service_error(oci.exceptions.ServiceError(status=401, code="NotAuthenticated", message="", headers={}))
+        self.manager()
+        self.assertEqual(self.lookups(), 2)
+
+    def test_other_errors_keep_cached_namespace(self):
+        self.manager()
+        manager = self.manager()
+        manager.note_service_error(oci.exceptions.ServiceError(status=404, code="ObjectNotFound", message="", headers={}))
+        self.manager()
+        self.assertEqual(self.lookups(), 1)
+
+
+class TestWildcardMatches(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for name in ("a.txt", "b.txt", "c.log", ".hidden.txt", ".env", "sub/d.txt", "sub/.e.txt", "dir.txt/f.txt"):
+            path = os.path.join(self.test_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(name)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_parity_with_glob(self):
+        for pattern in ("*.txt", "*", "?.txt", "[ab].txt", ".*", ".*.txt", "*.missing", "sub/*", "sub/.*", "*/*.txt", "missing/*"):
+            with self.subTest(pattern=pattern):
+                pattern = os.path.join(self.test_dir, pattern)
+                expected = sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+                self.assertEqual(sorted(iter_wildcard_matches(pattern)), expected)
+
+    def test_dotfiles_need_a_leading_dot(self):
+        matches = {os.path.basename(path) for path in iter_wildcard_matches(os.path.join(self.test_dir, "*"))}
+        self.assertEqual(matches, {"a.txt", "b.txt", "c.log"})
+
+    def test_directories_are_not_matched(self):
+        matches = {os.path.basename(path) for path in iter_wildcard_matches(os.path.join(self.test_dir, "*.txt"))}
+        self.assertNotIn("dir.txt", matches)
+
+
+class _PeakCountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    """Thread pool recording how many submitted tasks were unfinished at once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = 0
+        self.peak_pending = 0
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        future = super().submit(fn, *args, **kwargs)
+        with self._lock:
+            self.submitted += 1
+            self._pending.add(future)
+            self.peak_pending = max(self.peak_pending, len(self._pending))
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+
+class TestBulkTransfers(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.manager = FakeOCIManager({"dir/a.txt": b"a", "dir/sub/b.txt": b"bb", "dir/sub/c.txt": b"ccc"})
+        self.logger = logging.getLogger("ocutil")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def forbid(self, object_name):
+        """Makes GETs of object_name fail with a 403."""
+        get_object = self.manager.object_storage.get_object
+
+        def get_or_forbid(namespace_name, bucket_name, name, **kwargs):
+            if name == object_name:
+                raise oci.exceptions.ServiceError(status=403, code="Forbidden", message="denied", headers={})
+            return get_object(namespace_name, bucket_name, name, **kwargs)
+        self.manager.object_storage.get_object = get_or_forbid
+
+    def test_folder_download_mirrors_objects(self):
+        self.assertTrue(Downloader(self.manager).download_folder("bucket", "dir", self.test_dir, parallel_count=2))
+        for relative_path, data in (("a.txt", b"a"), ("sub/b.txt", b"bb"), ("sub/c.txt", b"ccc")):
+            with open(os.path.join(self.test_dir, relative_path), 'rb') as f:
+                self.assertEqual(f.read(), data)
+
+    def test_folder_download_reports_failed_objects(self):
+        self.forbid("dir/sub/b.txt")
+        with self.assertLogs("ocutil.downloader", level="WARNING") as log:
+            self.assertFalse(Downloader(self.manager).download_folder("bucket", "dir/", self.test_dir, parallel_count=2))
+        self.assertTrue(any("dir/sub/b.txt" in message for message in log.output))
+        # The other objects are still downloaded
+        self.assertEqual(sorted(os.listdir(os.path.join(self.test_dir, "sub"))), ["c.txt"])
+
+    def test_folder_download_window_is_bounded(self):
+        manager = FakeOCIManager({f"dir/{i:03d}": b"x" for i in range(100)})
+        downloader = Downloader(manager)
+        with _PeakCountingExecutor(max_workers=2) as executor:
+            downloader.executor = executor
+            self.assertTrue(downloader.download_folder("bucket", "dir/", self.test_dir, parallel_count=2))
+        self.assertEqual(executor.submitted, 100)
+        self.assertLessEqual(executor.peak_pending, 2 * DOWNLOAD_WINDOW_FACTOR)
+
+    @patch('ocutil.utils.uploader.UploadManager.upload_file')
+    def test_folder_upload_failure_exits_nonzero(self, mock_upload_file):
+        with open(os.path.join(self.test_dir, "a.txt"), 'w') as f:
+            f.write("a")
+        mock_upload_file.side_effect = oci.exceptions.ServiceError(status=403, code="Forbidden", message="denied", headers={})
+        args = _PARSER.parse_args(["cp", self.test_dir, "oc://bucket/prefix/", "--parallel", "2"])
+        with self.assertRaises(SystemExit) as context, self.assertLogs("ocutil", level="ERROR"):
+            handle_cp_command(args, self.manager, self.logger)
+        self.assertEqual(context.exception.code, 1)
+
+    @patch('ocutil.utils.uploader.UploadManager.upload_file', return_value=MagicMock(status=200))
+    def test_folder_upload_success_returns_true(self, mock_upload_file):
+        with open(os.path.join(self.test_dir, "a.txt"), 'w') as f:
+            f.write("a")
+        self.assertTrue(Uploader(self.manager).upload_folder(self.test_dir, "bucket", "prefix", parallel_count=2))
+        self.assertEqual(mock_upload_file.call_args.kwargs['object_name'], "prefix/a.txt")
+
+
+class TestFolderListing(unittest.TestCase):
+    NAMES = [f"dir/{i:02d}" for i in range(7)]
+
+    def list_names(self, **storage_options):
+        manager = FakeOCIManager({name: b"x" for name in self.NAMES}, **storage_options)
+        names = [obj.name for obj in Downloader(manager)._iter_objects("bucket", "dir/", limit=3)]
+        return names, [call for call in manager.object_storage.calls if call[0] == 'list_objects']
+
+    def test_pages_follow_next_start_with(self):
+        names, listings = self.list_names()
+        self.assertEqual(names, self.NAMES)
+        self.assertEqual([call[3] for call in listings], [None, "dir/03", "dir/06"])
+
+    def test_full_pages_without_token_continue_after_last_name(self):
+        names, listings = self.list_names(continuation_token=False)
+        self.assertEqual(names, self.NAMES)
+        self.assertEqual([call[4] for call in listings], [None, "dir/02", "dir/05"])
+
+    def test_short_page_without_token_ends_listing(self):
+        # A page shorter than the limit is the last one, even without a continuation token
+        names, listings = self.list_names(page_size=2, continuation_token=False)
+        self.assertEqual(names, self.NAMES[:2])
+        self.assertEqual(len(listings), 1)
+
+    def test_only_transfer_fields_are_requested(self):
+        manager = FakeOCIManager({"dir/a": b"x"})
+        with patch.object(manager.object_storage, 'list_objects', wraps=manager.object_storage.list_objects) as mock_list:
+            list(Downloader(manager)._iter_download_tasks("bucket", "dir/", "dest", 1000))
+        self.assertEqual(mock_list.call_args.kwargs['fields'], "name,size,etag")
+
+
+class TestMultipartPartSize(unittest.TestCase):
+    MIB = 1024 * 1024
+
+    def test_default_part_size_up_to_the_part_limit(self):
+        self.assertEqual(_multipart_part_size(200 * self.MIB), MULTIPART_PART_SIZE)
+        self.assertEqual(_multipart_part_size(MAX_MULTIPART_PARTS * MULTIPART_PART_SIZE), MULTIPART_PART_SIZE)
+
+    def test_grows_to_whole_mib_above_the_part_limit(self):
+        file_size = MAX_MULTIPART_PARTS * MULTIPART_PART_SIZE + 1
+        part_size = _multipart_part_size(file_size)
+        self.assertEqual(part_size, MULTIPART_PART_SIZE + self.MIB)
+        self.assertEqual(part_size % self.MIB, 0)
+
+    def test_never_needs_more_parts_than_allowed(self):
+        for file_size in (1, 100 * self.MIB, 90 * 1024 ** 3, 1024 ** 4, 10 * 1024 ** 4 - 1):
+            with self.subTest(file_size=file_size):
+                part_size = _multipart_part_size(file_size)
+                self.assertGreaterEqual(part_size, MULTIPART_PART_SIZE)
+                self.assertLessEqual(math.ceil(file_size / part_size), MAX_MULTIPART_PARTS)
+
+
+class TestProcessBackend(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.objects = {f"dir/sub{i % 2}/{i}.bin": os.urandom(100 + i) for i in range(6)}
+        self.manager = FakeOCIManager(self.objects)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_thread_backend_shares_the_client(self):
+        with create_executor('thread', 2, self.manager) as executor:
+            self.assertIsInstance(executor, concurrent.futures.ThreadPoolExecutor)
+            future = submit_transfer(executor, Downloader(self.manager), '_download_worker', (),
+                                     "bucket", "dir/sub0/0.bin", os.path.join(self.test_dir, "0.bin"))
+            self.assertTrue(future.result()[0])
+        self.assertIn('get_object', [call[0] for call in self.manager.object_storage.calls])
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs the fork start method")
+    def test_folder_download_in_worker_processes(self):
+        executor = create_executor('process', 2, self.manager)
+        try:
+            downloader = Downloader(self.manager, executor=executor)
+            self.assertTrue(downloader.download_folder("bucket", "dir/", self.test_dir, parallel_count=2))
+        finally:
+            executor.shutdown(wait=True)
+        for name, data in self.objects.items():
+            with open(os.path.join(self.test_dir, name[len("dir/"):]), 'rb') as f:
+                self.assertEqual(f.read(), data)
+        # Only the listing ran here; the workers fetched with their own copies of the client
+        self.assertNotIn('get_object', [call[0] for call in self.manager.object_storage.calls])
+
+    def test_spawned_workers_rebuild_the_manager_from_its_config(self):
+        with patch('ocutil.utils.concurrency.multiprocessing.get_all_start_methods', return_value=['spawn']), \
+                patch('ocutil.utils.concurrency.concurrent.futures.ProcessPoolExecutor') as mock_pool:
+            create_executor('process', 3, self.manager)
+        kwargs = mock_pool.call_args.kwargs
+        self.assertEqual(kwargs['max_workers'], 3)
+        self.assertEqual(kwargs['mp_context'].get_start_method(), 'spawn')
+        self.assertIs(kwargs['initializer'], _init_worker_process)
+        self.assertEqual(kwargs['initargs'][:3], ("DEFAULT", {}, "fake-namespace"))
+
+    def test_worker_process_keeps_one_transfer_per_options(self):
+        local_path = os.path.join(self.test_dir, "0.bin")
+        with patch('ocutil.utils.concurrency._process_manager', self.manager), \
+                patch.dict('ocutil.utils.concurrency._process_transfers', clear=True) as transfers:
+            for _ in range(2):
+                result = _run_in_worker_process(Downloader, (('part_parallel_count', 3),), '_download_worker',
+                                                "bucket", "dir/sub0/0.bin", local_path)
+                self.assertTrue(result[0])
+            self.assertEqual(len(transfers), 1)
+            self.assertEqual(next(iter(transfers.values())).part_parallel_count, 3)
+
+
+class _LoggingCase(unittest.TestCase):
+    """Runs setup_logging against a fresh root logger and restores the test runner's afterwards."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.test_dir, "ocutil.log")
+        root = logging.getLogger()
+        self.saved_root = (root.handlers[:], root.level)
+        root.handlers = []
+
+    def tearDown(self):
+        root = logging.getLogger()
+        for handler in root.handlers:
+            listener = getattr(handler, 'listener', None)
+            if listener is not None:
+                listener.stop()
+                for target in listener.handlers:
+                    target.close()
+        root.handlers, level = self.saved_root
+        root.setLevel(level)
+        shutil.rmtree(self.test_dir)
+
+
+class TestRedirectedStderrLogging(_LoggingCase):
+    def setUp(self):
+        super().setUp()
+        self.stderr = io.StringIO()
+        for patcher in (patch('sys.stderr', new=self.stderr), patch('ocutil.main.atexit.register'),
+                        patch('ocutil.main.LOG_BUFFER_FLUSH_INTERVAL', 0.05)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        setup_logging()
+        self.logger = logging.getLogger("ocutil.test")
+
+    def wait_for_output(self, text, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while text not in self.stderr.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.stderr.getvalue()
+
+    def test_info_is_written_without_further_records(self):
+        self.logger.info("listing page 1")
+        self.assertIn("listing page 1", self.wait_for_output("listing page 1"))
+
+    def test_info_is_batched(self):
+        with patch('ocutil.main.LOG_BUFFER_FLUSH_INTERVAL', 60):
+            self.logger.info("first")
+            self.logger.info("second")
+            time.sleep(0.1)
+            self.assertEqual(self.stderr.getvalue(), "")
+            flush_logging()
+        self.assertIn("second", self.stderr.getvalue())
+
+    def test_records_show_the_thread_name(self):
+        threading.Thread(target=self.logger.info, args=("from a worker",), name="Worker-7").start()
+        self.assertRegex(self.wait_for_output("from a worker"), r"\[INFO\] Worker-7 ocutil\.test: from a worker")
+
+    def test_logging_module_globals_are_left_alone(self):
+        self.assertIsNotNone(logging._srcfile)
+        self.assertTrue(logging.logThreads)
+        self.assertTrue(logging.logProcesses)
+
+    def test_warning_flushes_held_records(self):
+        with patch('ocutil.main.LOG_BUFFER_FLUSH_INTERVAL', 60):
+            self.logger.info("before")
+            self.logger.warning("slow down")
+            output = self.wait_for_output("slow down")
+        self.assertLess(output.index("before"), output.index("slow down"))
+
+
+class TestQueuedLogging(_LoggingCase):
+    def setUp(self):
+        super().setUp()
+        self.stderr = io.StringIO()
+        for patcher in (patch('sys.stderr', new=self.stderr), patch('ocutil.main.atexit.register'),
+                        patch('ocutil.main.LOG_BUFFER_FLUSH_INTERVAL', 60)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        setup_logging()
+
+    def test_root_logger_only_queues_records(self):
+        handlers = logging.getLogger().handlers
+        self.assertEqual(len(handlers), 1)
+        self.assertIsInstance(handlers[0], logging.handlers.QueueHandler)
+
+    def test_handlers_run_on_the_listener_thread(self):
+        threads = []
+        listener = logging.getLogger().handlers[0].listener
+        with patch.object(listener.handlers[0], 'emit', side_effect=lambda record: threads.append(threading.current_thread())):
+            logging.getLogger("ocutil.test").info("queued")
+            flush_logging()
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_flush_logging_writes_queued_records(self):
+        logging.getLogger("ocutil.test").info("record %d of %d", 1, 2)
+        flush_logging()
+        self.assertIn("ocutil.test: record 1 of 2", self.stderr.getvalue())
+        # The listener keeps running after a flush
+        logging.getLogger("ocutil.test").info("after the flush")
+        flush_logging()
+        self.assertIn("after the flush", self.stderr.getvalue())
+
+
+class TestLogFileBuffering(_LoggingCase):
+    def setUp(self):
+        super().setUp()
+        self.handler = _BufferedFileHandler(self.log_file)
+        self.handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.addCleanup(self.handler.close)
+
+    def record(self, level, message):
+        return logging.LogRecord("ocutil.test", level, __file__, 1, message, None, None)
+
+    def contents(self):
+        with open(self.log_file) as f:
+            return f.read()
+
+    def test_info_waits_for_the_buffer(self):
+        self.handler.emit(self.record(logging.INFO, "progress"))
+        self.assertEqual(self.contents(), "")
+        self.handler.flush()
+        self.assertEqual(self.contents(), "INFO progress\n")
+
+    def test_warning_is_written_at_once(self):
+        self.handler.emit(self.record(logging.INFO, "progress"))
+        self.handler.emit(self.record(logging.WARNING, "retrying"))
+        self.assertEqual(self.contents(), "INFO progress\nWARNING retrying\n")
+
+
+class TestCachedTimeFormatter(unittest.TestCase):
+    def test_matches_the_plain_formatter(self):
+        cached = _CachedTimeFormatter(datefmt=LOG_DATE_FORMAT)
+        plain = logging.Formatter(datefmt=LOG_DATE_FORMAT)
+        record = logging.LogRecord("ocutil.test", logging.INFO, __file__, 1, "message", None, None)
+        for created in (1700000000.1, 1700000000.9, 1700000001.0, 1699999999.5):
+            record.created = created
+            self.assertEqual(cached.formatTime(record, cached.datefmt), plain.formatTime(record, plain.datefmt))
+
+    def test_formats_each_second_once(self):
+        formatter = _CachedTimeFormatter(datefmt=LOG_DATE_FORMAT)
+        record = logging.LogRecord("ocutil.test", logging.INFO, __file__, 1, "message", None, None)
+        with patch.object(logging.Formatter, 'formatTime', return_value="then") as mock_format:
+            for created in (1700000000.1, 1700000000.5, 1700000000.9, 1700000001.2):
+                record.created = created
+                formatter.formatTime(record, formatter.datefmt)
+        self.assertEqual(mock_format.call_count, 2)
+
+
+class TestForkedWorkerLogging(_LoggingCase):
+    """Forked worker processes must not write out copies of records logged before the fork."""
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs the fork start method")
+    def test_records_logged_before_fork_are_written_once(self):
+        # Redirected stderr and a log file: both buffer records before writing them
+        with patch('sys.stderr', new=io.StringIO()), patch('ocutil.main.atexit.register'):
+            setup_logging(log_file=self.log_file)
+            test_logger = logging.getLogger("ocutil.test")
+            for i in range(5):
+                test_logger.info("record %d", i)
+            executor = create_executor('process', 3, FakeOCIManager())
+            executor.shutdown(wait=True)
+            flush_logging()
+        with open(self.log_file) as f:
+            lines = [line for line in f if "ocutil.test" in line]
+        self.assertEqual(len(lines), 5, "".join(lines))
+
+
+@patch('multiprocessing.cpu_count', return_value=8)
+class TestDefaultParallelCount(unittest.TestCase):
+    def probes(self, manager):
+        return [call for call in manager.object_storage.calls if call[0] == 'head_bucket']
+
+    def test_cpu_count_without_rtt(self, _):
+        self.assertEqual(pick_parallel_count(None), 8)
+
+    def test_cpu_count_is_the_floor(self, _):
+        self.assertEqual(pick_parallel_count(0.001), 8)
+
+    def test_long_round_trips_are_capped_at_twice_the_cpu_count(self, _):
+        self.assertEqual(pick_parallel_count(10.0), 16)
+
+    def test_default_bandwidth_skips_the_probe(self, _):
+        manager = FakeOCIManager()
+        with patch.dict(os.environ):
+            os.environ.pop("OCUTIL_BANDWIDTH_MBPS", None)
+            self.assertEqual(default_parallel_count(manager, "bucket"), 8)
+        self.assertEqual(self.probes(manager), [])
+
+    def test_high_bandwidth_probes_without_retries(self, _):
+        manager = FakeOCIManager()
+        with patch.dict(os.environ, {"OCUTIL_BANDWIDTH_MBPS": "100000"}):
+            with patch('ocutil.utils.concurrency.measure_rtt', wraps=measure_rtt) as mock_measure:
+                count = default_parallel_count(manager, "bucket")
+        mock_measure.assert_called_once()
+        self.assertGreaterEqual(count, 8)
+        probes = self.probes(manager)
+        self.assertEqual(len(probes), 2)
+        self.assertTrue(all(isinstance(call[2], oci.retry.NoneRetryStrategy) for call in probes))
+
+    def test_failed_probe_falls_back_to_cpu_count(self, _):
+        manager = FakeOCIManager()
+        manager.object_storage.head_bucket = MagicMock(side_effect=oci.exceptions.ServiceError(
+            status=503, code="ServiceUnavailable", message="", headers={}))
+        with patch.dict(os.environ, {"OCUTIL_BANDWIDTH_MBPS": "100000"}):
+            self.assertEqual(default_parallel_count(manager, "bucket"), 8)
+        manager.object_storage.head_bucket.assert_called_once()
+
+
+class _SimulatedClock:
+    """Stands in for the time module in ocutil.utils.concurrency; time only moves when advanced."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class TestAdaptiveConcurrencyLimit(unittest.TestCase):
+    def setUp(self):
+        self.clock = _SimulatedClock()
+        patcher = patch('ocutil.utils.concurrency.time', new=self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_window(self, limiter, sizes):
+        """Completes one window of the given transfer sizes over one second and returns the new limit."""
+        self.clock.advance(1.0)
+        for size in sizes:
+            limiter.record(size)
+        return limiter.update()
+
+    def steady_window(self, limiter, size=1024 * 1024):
+        return self.run_window(limiter, [size] * (limiter.limit * SAMPLE_COMPLETIONS_PER_SLOT))
+
+    def test_mixed_object_sizes_do_not_lower_the_limit(self):
+        # Lognormal sizes make the completed-bytes rate swing widely from one window to the next
+        rng = random.Random(7)
+        limiter = AdaptiveConcurrencyLimit(32)
+        limits = []
+        for _ in range(300):
+            sizes = [int(rng.lognormvariate(13, 2)) for _ in range(limiter.limit * SAMPLE_COMPLETIONS_PER_SLOT)]
+            limits.append(self.run_window(limiter, sizes))
+        self.assertEqual(min(limits), 32)
+
+    def test_congestion_halves_the_limit_once_per_window(self):
+        limiter = AdaptiveConcurrencyLimit(16)
+        for _ in range(5):
+            limiter.record_congestion()
+        self.assertEqual(limiter.limit, 8)
+        self.steady_window(limiter)
+        limiter.record_congestion()
+        self.assertEqual(limiter.limit, 4)
+
+    def test_limit_never_drops_below_one(self):
+        limiter = AdaptiveConcurrencyLimit(2)
+        for _ in range(4):
+            limiter.record_congestion()
+            self.steady_window(limiter)
+        self.assertEqual(limiter.limit, 1)
+
+    def test_grows_back_one_slot_per_window_up_to_the_maximum(self):
+        limiter = AdaptiveConcurrencyLimit(16)
+        limiter.record_congestion()
+        # The window after a cut only measures the new limit
+        self.assertEqual(self.steady_window(limiter), 8)
+        limits = [self.steady_window(limiter) for _ in range(10)]
+        self.assertEqual(limits, [9, 10, 11, 12, 13, 14, 15, 16, 16, 16])
+
+    def test_growth_pauses_while_smoothed_throughput_falls(self):
+        limiter = AdaptiveConcurrencyLimit(16)
+        limiter.record_congestion()
+        self.steady_window(limiter)
+        size = 1024 * 1024
+        for _ in range(5):
+            size //= 2
+            self.assertEqual(self.steady_window(limiter, size), 8)
+
+    def test_short_windows_are_not_sampled(self):
+        limiter = AdaptiveConcurrencyLimit(4)
+        limiter.record_congestion()
+        # Too few completions for a window at this limit, however long it took
+        self.clock.advance(10.0)
+        limiter.record(1)
+        self.assertEqual(limiter.update(), 2)
+        self.assertTrue(limiter._backed_off)
+
+
+class TestAdaptiveDownloads(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.manager = FakeOCIManager({f"dir/{i:02d}": b"x" * 10 for i in range(40)})
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_congestion_is_classified(self):
+        service_error = lambda status: oci.exceptions.ServiceError(status=status, code="", message="", headers={})
+        self.assertTrue(_is_congestion(service_error(429)))
+        self.assertTrue(_is_congestion(service_error(503)))
+        self.assertTrue(_is_congestion(socket.timeout("timed out")))
+        self.assertFalse(_is_congestion(service_error(404)))
+        self.assertFalse(_is_congestion(ConnectionResetError("reset")))
+
+    def test_in_flight_downloads_stay_within_the_limit(self):
+        downloader = Downloader(self.manager, adaptive=True)
+        with _PeakCountingExecutor(max_workers=4) as executor:
+            downloader.executor = executor
+            self.assertTrue(downloader.download_folder("bucket", "dir/", self.test_dir, parallel_count=2))
+        self.assertEqual(executor.submitted, 40)
+        self.assertLessEqual(executor.peak_pending, 2)
+
+    def task_sizes(self, **options):
+        downloader = Downloader(FakeOCIManager({"dir/a": b"x", "dir/b": b"x" * 30, "dir/c": b"x" * 20}), **options)
+        return [size for _, _, size, _ in downloader._iter_download_tasks("bucket", "dir/", self.test_dir, 1000)]
+
+    def test_downloads_start_largest_first(self):
+        self.assertEqual(self.task_sizes(), [30, 20, 1])
+
+    def test_adaptive_downloads_keep_name_order(self):
+        self.assertEqual(self.task_sizes(adaptive=True), [1, 30, 20])
+
+    def test_throttled_downloads_back_off(self):
+        get_object = self.manager.object_storage.get_object
+
+        def throttle_some(namespace_name, bucket_name, object_name, **kwargs):
+            if object_name.endswith("7"):
+                raise oci.exceptions.ServiceError(status=429, code="TooManyRequests", message="slow down", headers={})
+            return get_object(namespace_name, bucket_name, object_name, **kwargs)
+
+        self.manager.object_storage.get_object = throttle_some
+        downloader = Downloader(self.manager, adaptive=True)
+        with patch.object(AdaptiveConcurrencyLimit, 'record_congestion', autospec=True) as mock_congestion, \
+                self.assertLogs("ocutil.downloader", level="ERROR"):
+            self.assertFalse(downloader.download_folder("bucket", "dir/", self.test_dir, parallel_count=4))
+        self.assertEqual(mock_congestion.call_count, 4)
+
+
 # --- Main execution ---
 if __name__ == "__main__":
     # Add handler to root logger to see output from tested modules if needed